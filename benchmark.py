@@ -0,0 +1,7 @@
+import os
+os.environ["SDL_VIDEODRIVER"] = "dummy" # Benchmarks always run headless, must be set before the game is imported
+
+from src.benchmark import main
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
 from colorsys import rgb_to_hsv, hsv_to_rgb
 from copy import copy
+from math import ceil
 import pygame
 
-from .constants import VEC, PIXEL_SIZE, TILE_SIZE
-from .utils import clamp
+from .constants import VEC, HEIGHT, PIXEL_SIZE, TILE_SIZE, DANGER_STRIP, SNOWFLAKE_ANGLES, SNOWBALL_ANGLES, PLAYER_ANGLE, PLAYER_CACHE_SIZE
+from .utils import clamp, shadow, LRUCache
 from .exe import pathof
 
 def load_img(file: str, factor: float = PIXEL_SIZE, alpha: bool = True):
@@ -41,6 +42,12 @@ snowflakes: list[pygame.Surface] = []
 for i in range(10):
     snowflakes.append(load_img(f"{TEXTURES}/snowflake/snowflake_{i}.png", 3, alpha=False))
     snowflakes[i].set_colorkey((0, 0, 0))
+snowflake_weights = [10, 9, 8, 7, 3, 3, 2, 2, 1, 2]
+# Snowflakes spawn all the time, so every rotation they can spawn at is made once here instead of on every spawn
+snowflake_atlas: list[list[pygame.Surface]] = [
+    [pygame.transform.rotate(snowflake, i * 360 / SNOWFLAKE_ANGLES) for i in range(SNOWFLAKE_ANGLES)]
+    for snowflake in snowflakes
+]
 
 ground_tiles: list[pygame.Surface] = [
     load_img(f"{TEXTURES}/ground/ground.png", alpha=False).subsurface(0, 0, TILE_SIZE * 2, TILE_SIZE),
@@ -82,6 +89,15 @@ infinite_snowballs = load_img(f"{TEXTURES}/misc/infinity.png", alpha=True)
 instruction1 = load_img(f"{TEXTURES}/misc/instruction1.png", alpha=False, factor=0.4)
 instruction2 = load_img(f"{TEXTURES}/misc/instruction2.png", alpha=False, factor=0.4)
 
+# The shading past the right border, subtracted from the screen, left to right until it stops getting darker
+# Everything further out than this is shaded like its last step
+danger_zone = pygame.Surface((ceil((255 - 20) / 2) * DANGER_STRIP, HEIGHT))
+for i in range(danger_zone.width // DANGER_STRIP):
+    danger_zone.fill((0, 20 + i * 2, 20 + i * 2), (i * DANGER_STRIP, 0, DANGER_STRIP, HEIGHT))
+DANGER_ZONE_END = (0, 255, 255)
+# The left border's shading goes the other way
+danger_zone_left = pygame.transform.flip(danger_zone, True, False)
+
 class Frames:
     def __init__(self, path: str, prefix: str) -> None:
         self.elements = []
@@ -157,6 +173,28 @@ class PlayerAssets:
             for color in self.skin_colors:
                 palette_swap_frames(frames, color, lightness_shift(color, self.skin_tone))
         self.player = self.player_idle.elements + self.player_idle_l.elements + self.player_idle_s.elements + self.player_dig.elements + self.player_run.elements + self.player_run_s.elements + self.player_run_l.elements + self.player_throw_l.elements + self.player_throw_s.elements
+        self.index = {frame: i for i, frame in enumerate(self.player)}
+        self.transformed = LRUCache(PLAYER_CACHE_SIZE)
+        self.glows = LRUCache(PLAYER_CACHE_SIZE)
+
+    def get_frame(self, index: int, flip: bool, rotation: float) -> pygame.Surface:
+        # Players are rotated to the slope of the ground, so only a handful of angles ever come up
+        angle = round(rotation / PLAYER_ANGLE) * PLAYER_ANGLE % 360
+        key = (index, flip, angle)
+        if (frame := self.transformed.get(key)) is None:
+            frame = pygame.transform.rotate(pygame.transform.flip(self.player[index], flip, False), angle)
+            self.transformed[key] = frame
+        return frame
+
+    def get_glow(self, index: int, flip: bool, rotation: float, color: tuple[int, int, int]) -> pygame.Surface:
+        # The powerup glow around a transformed frame, fully opaque so that the pulse can be applied with set_alpha
+        angle = round(rotation / PLAYER_ANGLE) * PLAYER_ANGLE % 360
+        key = (index, flip, angle, color)
+        if (glow := self.glows.get(key)) is None:
+            mask = pygame.mask.from_surface(self.get_frame(index, flip, rotation))
+            glow = mask.scale(VEC(mask.get_size()) + (20, 14)).to_surface(setcolor=(*color, 255), unsetcolor=(0, 0, 0, 0))
+            self.glows[key] = glow
+        return glow
 
 player_idle = Frames("player", "player_idle_")
 player_idle_l = Frames("player", "player_idle_l_")
@@ -171,6 +209,14 @@ player = player_idle.elements + player_idle_l.elements + player_idle_s.elements
 
 snowball_large = Frames("snowball", "snowball_large_")
 snowball_small = Frames("snowball", "snowball_small_")
+# Snowballs spin the whole time they're in the air, so every frame is rotated ahead of time along with its shadow
+# Both are indexed by [frames][frame][angle step], angle step 0 being the unrotated frame
+snowball_rotations: dict[Frames, list[list[pygame.Surface]]] = {}
+snowball_shadows: dict[Frames, list[list[pygame.Surface]]] = {}
+for frames in [snowball_small, snowball_large]:
+    snowball_rotations[frames] = [[pygame.transform.rotate(frame, i * 360 / SNOWBALL_ANGLES) for i in range(SNOWBALL_ANGLES)] for frame in frames.elements]
+    snowball_shadows[frames] = [[shadow(image) for image in rotations] for rotations in snowball_rotations[frames]]
+del frames
 
 pygame.display.quit()
 
@@ -4,12 +4,14 @@ if TYPE_CHECKING:
     from src.player import Player
 
 from src.sprite import VisibleSprite, Layers
-from pygame.locals import SRCALPHA
+from pygame.locals import SRCALPHA, BLEND_RGBA_ADD
 from src.scene import Scene
 import pygame
 import time
 
 class Aura(VisibleSprite):
+    interpolated = True
+
     base_img = pygame.Surface((500, 500), SRCALPHA)
     base_img.fill((0, 0, 0, 0))
     for i in range(10):
@@ -20,23 +22,33 @@ class Aura(VisibleSprite):
         super().__init__(scene, Layers.AURA)
         self.player = player
         self.pos = player.pos
+        # The rings replace the pixels of base_img they're drawn over rather than blending with them, so each aura
+        # keeps its own copy and only puts back the part of base_img the last frame's rings were drawn on
         self.image = self.base_img.copy()
+        self.dirty = pygame.Rect(250, 250, 0, 0)
         self.rings = []
         self.ring_time = time.time()
 
     def update(self) -> None:
         self.pos = self.player.pos - (0, self.player.size.y // 2)
-        if time.time() - self.ring_time > 0.5:
+        if time.time() - self.ring_time > self.manager.quality.get(1.5, 0.8, 0.5):
             self.rings.append(0)
             self.ring_time = time.time()
-
-    def draw(self) -> None:
-        self.image = self.base_img.copy()
         for i, rad in enumerate(self.rings):
             if rad > 250:
                 self.rings.pop(i)
                 continue
-            pygame.draw.circle(self.image, (204, 102, 255, 45), (250, 250), rad, int(5 + 10 * (rad / 250)))
             self.rings[i] += 100 * self.manager.dt
 
-        self.scene.manager.screen.blit(self.image, self.pos - self.scene.player.camera.offset - (250, 250))
\ No newline at end of file
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos - (250, 250), (500, 500))
+
+    def draw(self) -> None:
+        # Filling with transparent and adding base_img on top copies its pixels exactly, a plain blit would blend them
+        self.image.fill((0, 0, 0, 0), self.dirty)
+        self.image.blit(self.base_img, self.dirty, self.dirty, special_flags=BLEND_RGBA_ADD)
+        self.dirty = pygame.Rect(250, 250, 0, 0)
+        for rad in self.rings:
+            self.dirty.union_ip(pygame.draw.circle(self.image, (204, 102, 255, 45), (250, 250), rad, int(5 + 10 * (rad / 250))))
+        self.scene.manager.screen.blit(self.image, self.pos - self.scene.player.camera.offset - (250, 250))
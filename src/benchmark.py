@@ -0,0 +1,253 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from scene import Scene
+
+from random import seed, randint, uniform
+from time import perf_counter
+from pathlib import Path
+import datetime
+import platform
+import pygame
+import json
+import sys
+import os
+
+from .main_game import MainGame, HitText
+from .manager import GameManager
+from .profiling import FrameStats
+from .quality import QualityGovernor
+from .others import OtherPlayer
+from .swirl import VortexSwirl
+from .constants import FPS, WIDTH
+from .powerup import Powerup
+from .utils import get_arg
+from .sprite import Layers
+
+# Scripted stress scenarios, run headlessly with a fixed seed and a fixed DT so that runs can be compared:
+#   python benchmark.py [--scenario=snowballs,vortices] [--frames=600] [--warmup=60] [--seed=1] [--quality=high] [--no-draw]
+# Results are saved to profiles/ and compared against --baseline (profiles/benchmark_baseline.json by default),
+# pass --save-baseline to make the current run the new baseline
+# Anything timed with time.time() in game (animations, spawn timers, lifespans) still runs on the wall clock,
+# so the load is the same from run to run but what exactly is on screen on a given frame isn't
+
+BASELINE = os.path.join("profiles", "benchmark_baseline.json")
+TOLERANCE = 0.15 # How much slower a percentile can get before it counts as a regression
+NOISE_FLOOR = 0.1 # Milliseconds, differences smaller than this are never regressions
+
+class BenchmarkGame(MainGame):
+    # MainGame without a server, started straight into a running match on a fixed world seed
+    def __init__(self, manager: GameManager, previous_scene: Scene, world_seed: int) -> None:
+        super().__init__(manager, previous_scene)
+        self.world_seed = world_seed
+
+    def connect(self) -> None:
+        self.seed = self.world_seed
+        self.waiting = False
+
+    def spawn_initial_snowflakes(self) -> None:
+        # Setup reseeds from the system once the ground is generated, the starting snowflakes are the whole snowflakes scenario
+        seed(self.world_seed)
+        super().spawn_initial_snowflakes()
+
+class Scenario:
+    codes = [] # Cheat codes added to the player's name, the same stress knobs that can be used in game
+
+    def setup(self, scene: BenchmarkGame) -> None:
+        pass
+
+    def step(self, scene: BenchmarkGame, frame: int) -> None:
+        # Called before every frame, keeps the load topped up
+        pass
+
+class Snowflakes(Scenario):
+    # Nothing but the 1000 snowflakes every match starts with and the ones that keep spawning in
+    pass
+
+class OtherPlayers(Scenario):
+    count = 50
+
+    def setup(self, scene: BenchmarkGame) -> None:
+        for i in range(self.count):
+            player = OtherPlayer(scene, i, scene.player.pos + (uniform(-WIDTH, WIDTH), -200))
+            player.name = f"player{i}"
+            player.score = randint(0, 300)
+            player.powerup = i % 5 - 1
+            player.set_colors(randint(0, 360), randint(0, 360), randint(150, 255))
+            scene.manager.other_players[i] = player
+
+    def step(self, scene: BenchmarkGame, frame: int) -> None:
+        # Stands in for the position updates that would come in from the server
+        for player in scene.manager.other_players.values():
+            player.pos.x += uniform(-4, 4)
+            player.rotation = uniform(-20, 20)
+            player.flip = frame // 30 % 2 == 0
+            player.frame = frame // 6 % 4
+
+class Snowballs(Scenario):
+    count = 300
+
+    def step(self, scene: BenchmarkGame, frame: int) -> None:
+        while len(scene.player.snowballs) < self.count:
+            pos = scene.player.pos + (uniform(-WIDTH / 2, WIDTH / 2), uniform(-900, -300))
+            scene.player.spawn_snowball(randint(0, 1), pos, (uniform(-300, 300), uniform(-500, 0)), follow=False)
+
+class Vortices(Snowballs):
+    count = 100 # Snowballs for the vortices to pull on
+    vortices = 10
+
+    def step(self, scene: BenchmarkGame, frame: int) -> None:
+        super().step(scene, frame)
+        while len(VortexSwirl.instances) < self.vortices:
+            pos = scene.player.pos + (uniform(-WIDTH / 2, WIDTH / 2), uniform(-600, -100))
+            VortexSwirl(scene, Layers.SNOWBALL, pos, 128, 20)
+
+class Telekinesis(Scenario):
+    codes = ["infT"] # Keeps the telekinesis aura up the whole time
+    count = 30
+
+    def step(self, scene: BenchmarkGame, frame: int) -> None:
+        aimed = [sb for sb in scene.player.snowballs.values() if sb.type in {5, 6}]
+        for _ in range(self.count - len(aimed)):
+            pos = scene.player.pos + (uniform(-300, 300), uniform(-400, -100))
+            scene.player.spawn_snowball(randint(5, 6), pos, (uniform(-200, 200), uniform(-400, -200)), follow=False)
+        # Triggered snowballs are held in stasis for 20 seconds, so they pile up like they do in a long fight
+        if frame % 60 == 59:
+            for snowball in aimed:
+                snowball.trigger()
+
+SCENARIOS = {
+    "snowflakes": Snowflakes,
+    "other_players": OtherPlayers,
+    "snowballs": Snowballs,
+    "vortices": Vortices,
+    "telekinesis": Telekinesis,
+}
+
+def get_percentiles(times: list[float]) -> dict[str, float]:
+    # Milliseconds, nearest rank like the frame stats overlay
+    ordered = sorted(times)
+    pick = lambda q: ordered[int(q * (len(ordered) - 1))] * 1000
+    return {
+        "mean": sum(times) / len(times) * 1000,
+        "p50": pick(0.5),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1] * 1000,
+    }
+
+def run_scenario(manager: GameManager, name: str, frames: int, warmup: int, world_seed: int) -> dict:
+    # Class level registries outlive the scene that filled them
+    VortexSwirl.instances.clear()
+    Powerup.instances.clear()
+    HitText.hittexts.clear()
+
+    scenario = SCENARIOS[name]()
+    menu = manager.scene
+    menu.input_box.text = "@".join(["bench", *scenario.codes])
+    scene = BenchmarkGame(manager, menu, world_seed)
+    manager.scene = scene
+    scene.setup()
+    seed(world_seed) # Setup reseeds from the system once the ground is generated
+    scenario.setup(scene)
+
+    manager.dt = 1 / FPS
+    manager.frame_stats = FrameStats(frames)
+    manager.frame_stats.enabled = True
+    times = {"update": [], "draw": [], "frame": []}
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            manager.frame_stats.reset()
+        pygame.event.pump()
+        manager.events, manager.key_downs, manager.key_ups = {}, {}, {}
+        manager.key_presses = pygame.key.get_pressed()
+        scenario.step(scene, frame)
+
+        start = perf_counter()
+        scene.update()
+        mid = perf_counter()
+        if manager.draw_enabled:
+            scene.draw()
+        end = perf_counter()
+        manager.frame_stats.end_frame()
+        if frame >= warmup:
+            times["update"].append(mid - start)
+            times["draw"].append(end - mid)
+            times["frame"].append(end - start)
+
+    result = {pass_name: get_percentiles(pass_times) for pass_name, pass_times in times.items()}
+    result["classes"] = {
+        pass_name: {name: {"mean": avg, "p95": p95} for name, avg, p95 in manager.frame_stats.get_summary(pass_name, "class")[:8]}
+        for pass_name in ["update", "draw"]
+    }
+    result["scene"] = scene.get_debug_state()
+    manager.scene = menu
+    return result
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in results["scenarios"].items():
+        if name not in baseline["scenarios"]: continue
+        for pass_name in ["update", "draw", "frame"]:
+            for stat in ["p50", "p95"]:
+                new = result[pass_name][stat]
+                old = baseline["scenarios"][name][pass_name][stat]
+                if new > old * (1 + tolerance) and new - old > NOISE_FLOOR:
+                    regressions.append(f"{name} {pass_name} {stat}: {old:.2f} -> {new:.2f} ms")
+    return regressions
+
+def main() -> None:
+    names = get_arg("--scenario", ",".join(SCENARIOS)).split(",")
+    frames = int(get_arg("--frames", 600))
+    warmup = int(get_arg("--warmup", 60))
+    world_seed = int(get_arg("--seed", 1))
+    baseline_file = Path(get_arg("--baseline", BASELINE))
+    tolerance = float(get_arg("--tolerance", TOLERANCE))
+
+    manager = GameManager()
+    # The governor would otherwise change quality halfway through a run depending on how fast the machine is
+    manager.quality = QualityGovernor(get_arg("--quality", "high"), "high")
+    results = {
+        "seed": world_seed,
+        "frames": frames,
+        "warmup": warmup,
+        "draw": manager.draw_enabled,
+        "quality": manager.quality.level.name.lower(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.platform(),
+        "scenarios": {},
+    }
+    for name in names:
+        print(f"Running '{name}' for {frames} frames...")
+        result = run_scenario(manager, name, frames, warmup, world_seed)
+        results["scenarios"][name] = result
+        print(f"  update p50 {result['update']['p50']:.2f} / p95 {result['update']['p95']:.2f} ms, "
+              f"draw p50 {result['draw']['p50']:.2f} / p95 {result['draw']['p95']:.2f} ms")
+
+    # Naming the results file in the format "benchmark_{hour}-{minute}-{second}.json"
+    statfile = Path(os.path.join("profiles", str(datetime.datetime.now().strftime("benchmark_%H-%M-%S")) + ".json"))
+    statfile.parent.mkdir(exist_ok=True)
+    with open(statfile, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults saved to: {str(statfile)}")
+
+    if "--save-baseline" in sys.argv:
+        with open(baseline_file, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"Baseline saved to: {str(baseline_file)}")
+        return
+    if not baseline_file.exists():
+        print("No baseline to compare against, run with --save-baseline to save one")
+        return
+
+    with open(baseline_file) as file:
+        baseline = json.load(file)
+    if (baseline["frames"], baseline["seed"], baseline["draw"], baseline.get("quality")) != (frames, world_seed, manager.draw_enabled, results["quality"]):
+        print("Warning: the baseline was run with different settings, the comparison may not mean much")
+    regressions = compare(results, baseline, tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions against {str(baseline_file)}")
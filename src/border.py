@@ -41,5 +41,9 @@ class Border(VisibleSprite):
         target_x = (2400 - Border.shrink) - assets.border.get_height() // 2
         Border.x += (target_x - Border.x) * 5 * dt
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos + (0, self.offset), self.image.get_size())
+
     def draw(self) -> None:
         self.manager.screen.blit(self.image, self.pos + (0, self.offset) - self.scene.player.camera.offset)
\ No newline at end of file
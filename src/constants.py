@@ -1,18 +1,57 @@
+from functools import lru_cache
 import pygame
+import sys
+import os
 
 from .exe import pathof
 
+# Runs the client without a window or audio device, for load testing and benchmarks (--no-draw also skips drawing)
+# This has to happen before anything initializes the display, which assets.py does on import
+HEADLESS = "--headless" in sys.argv or os.environ.get("SDL_VIDEODRIVER") == "dummy"
+if HEADLESS:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
 VEC = pygame.math.Vector2
 WIDTH, HEIGHT = 1200, 675
 SCR_DIM = VEC(WIDTH, HEIGHT)
 FPS = 144
+MENU_FPS = 60 # Frame rate of menus and the waiting room
+IDLE_FPS = 20 # Frame rate of menus and the waiting room after IDLE_TIME seconds without input
+IDLE_TIME = 10
+TICK_RATE = 60 # Simulation steps per second when running with --fixed-step
+MAX_FRAME_TIME = 0.25 # Longest frame the fixed-step simulation will catch up on
+SPIKE_BUDGET = 1000 / 30 # Milliseconds of work in a frame before the spike recorder captures it
+QUALITY_BUDGET = 1 / 50 # Seconds of work per frame the quality governor steps quality down to stay under
+QUALITY_HEADROOM = 0.5 # Fraction of the budget frames have to be under before quality is stepped back up
+QUALITY_WINDOW = 60 # Frames the quality governor averages over
+QUALITY_HOLD = 3 # Seconds the quality governor waits after a change before changing again
 
 GRAVITY = 1200
+DANGER_STRIP = 15 # Width of each step of the shading past the borders, every step further out is darker
 PIXEL_SIZE = 3
 REAL_TILE_SIZE = 16
 TILE_SIZE = REAL_TILE_SIZE * PIXEL_SIZE
+SNOWFLAKE_ANGLES = 36 # Number of rotations every snowflake is pre-rendered at
+SNOWBALL_ANGLES = 72 # Number of rotations every snowball frame is pre-rendered at
+SWIRL_FPS = 60 # Frame rate that swirl animations are pre-rendered at
+SWIRL_LOOP = 4 # Seconds before a pre-rendered swirl animation repeats
+SHADOW_CACHE_SIZE = 512 # Shadows kept by get_shadow before the least recently used ones are dropped
+SHADOW_ANGLE = 2 # Degrees that rotations are snapped to for get_shadow
+PLAYER_ANGLE = 2 # Degrees that player rotations are snapped to, the same as shadows so that they line up
+PLAYER_CACHE_SIZE = 256 # Flipped and rotated frames kept for each set of player assets
 
 pygame.font.init()
 FONT = [pygame.font.Font(pathof("assets/fonts/PixelTandysoft-0rJG.ttf"), i) for i in range(1, 129)]
+TEXT_CACHE_SIZE = 512 # Rendered strings kept by render_text before the least recently used ones are dropped
+
+# Most text on screen is the same from frame to frame, so renders are cached by everything that goes into them
+# The surfaces are shared, so they must not be changed, render with an alpha instead of calling set_alpha on the result
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(size: int, text: str, antialias: bool, color: tuple[int, int, int], alpha: int | None = None) -> pygame.Surface:
+    surf = FONT[size].render(text, antialias, color)
+    if alpha is not None:
+        surf.set_alpha(alpha)
+    return surf
 STOPPING_CHARS = {" ", "!", "$", "%", "(", "-", "+", "{", "}", "[", "|", "\\", "?"}
 TEXT_COLOR = (0, 100, 220)
\ No newline at end of file
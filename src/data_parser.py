@@ -112,7 +112,7 @@ class Parser:
                         snowball.pos = VEC(snowball_data["pos"])
                         snowball.frame = snowball_data["frame"]
                     else:
-                        other.snowballs[snowball_data["id"]] = OtherSnowball(self.manager.scene, snowball_data["id"], snowball_data["pos"], snowball_data["frame"], snowball_data["type"])
+                        other.snowballs[snowball_data["id"]] = OtherSnowball.spawn(self.manager.scene, snowball_data["id"], snowball_data["pos"], snowball_data["frame"], snowball_data["type"])
 
             # # contains data for the image of the storm
             # if "storm_blobs" in player_data and player_data["storm_blobs"]:
@@ -1,5 +1,5 @@
 from .sprite import VisibleSprite, Layers
-from .constants import VEC, WIDTH
+from .constants import VEC
 from .utils import shadow
 from .scene import Scene
 from . import assets
@@ -22,9 +22,13 @@ class Tree(VisibleSprite):
     def update(self) -> None:
         ...
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos - (self.size.x // 2, self.size.y), self.size + (3, 3))
+
     def draw(self) -> None:
-        if self.pos.x < self.scene.player.camera.offset.x - 100 or self.pos.x > self.scene.player.camera.offset.x + WIDTH + 100: return
-        self.manager.screen.blit(self.shadow_image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+        if self.manager.quality.get(False, True, True):
+            self.manager.screen.blit(self.shadow_image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
         self.manager.screen.blit(self.image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset)
 
 class Rock(VisibleSprite):
@@ -41,7 +45,11 @@ class Rock(VisibleSprite):
     def update(self) -> None:
         ...
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos - (self.size.x // 2, self.size.y), self.size + (3, 3))
+
     def draw(self) -> None:
-        if self.pos.x < self.scene.player.camera.offset.x - 30 or self.pos.x > self.scene.player.camera.offset.x + WIDTH + 30: return
-        self.manager.screen.blit(self.shadow_image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+        if self.manager.quality.get(False, True, True):
+            self.manager.screen.blit(self.shadow_image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
         self.manager.screen.blit(self.image, self.pos - (self.size.x // 2, self.size.y) - self.scene.player.camera.offset, )
\ No newline at end of file
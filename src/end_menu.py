@@ -7,7 +7,7 @@ from pygame.locals import KEYDOWN, K_RETURN
 import pygame
 
 from .end_leaderboard import EndLeaderboard
-from .constants import WIDTH, HEIGHT
+from .constants import WIDTH, HEIGHT, MENU_FPS
 from .button import Button
 from .scene import Scene
 import time
@@ -29,6 +29,9 @@ class EndMenu(Scene):
         self.button = None
         self.appear_timer = time.time()
 
+    def get_target_fps(self) -> int:
+        return MENU_FPS
+
     def update(self) -> None:
         super().update()
 
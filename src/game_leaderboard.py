@@ -4,11 +4,14 @@ if TYPE_CHECKING:
     from scene import Scene
 
 from .sprite import VisibleSprite, Layers
-from .constants import VEC, FONT, WIDTH
+from .constants import VEC, WIDTH, render_text
+from .hud import Widget, Blits
 
 from pygame.locals import SRCALPHA
 import pygame
 
+MARGIN = 17 # Room left of the board for the arrow
+
 class GameLeaderboard(VisibleSprite):
     def __init__(self, scene: Scene) -> None:
         super().__init__(scene, Layers.GUI)
@@ -18,6 +21,7 @@ class GameLeaderboard(VisibleSprite):
 
         self.data = []
         self.index = 0
+        self.board = Widget(self.render)
 
     def update(self) -> None:
         self.data = [{"name": player.name, "score": player.score} for player in self.manager.other_players.values()]
@@ -25,17 +29,24 @@ class GameLeaderboard(VisibleSprite):
         self.data.sort(key = lambda d: d["score"], reverse=True)
         self.size.y = len(self.data) * 26 + 9
 
+    def render(self, size: tuple[int, int], rows: tuple[tuple[str, int, bool], ...]) -> Blits:
+        # The rows only change when someone scores or joins, so the whole board is drawn onto two surfaces
+        # that are blitted as they are until then, the lines and text are solid black so they can go on one layer
+        (background := pygame.Surface(size, SRCALPHA)).fill((255, 255, 255, 40))
+        # Left margin for the arrow pointing at the player's own row
+        board = pygame.Surface((size[0] + MARGIN, size[1]), SRCALPHA)
+        pygame.draw.rect(board, (0, 0, 0), (MARGIN, 0, *size), 3)
+        pygame.draw.line(board, (0, 0, 0), (MARGIN + 190, 0), (MARGIN + 190, size[1] - 1), 3)
+        for i, (name, score, is_self) in enumerate(rows):
+            if is_self:
+                pygame.draw.polygon(board, (0, 0, 0), [(MARGIN - 7, 16 + i * 26), (MARGIN - 17, 16 + i * 26 - 5), (MARGIN - 17, 16 + i * 26 + 5)])
+            board.blit(render_text(20, name, True, (0, 0, 0)), (MARGIN + 8, 1 + i * 26))
+            board.blit(render_text(20, str(score), True, (0, 0, 0)), (MARGIN + 198, 1 + i * 26))
+            if i == len(rows) - 1: continue
+            pygame.draw.line(board, (0, 0, 0), (MARGIN, 3 + (i + 1) * 26), (MARGIN + size[0] - 1, 3 + (i + 1) * 26), 3)
+        x, y = int(self.pos.x), int(self.pos.y)
+        return [(background, (x, y)), (board, (x - MARGIN, y))]
+
     def draw(self) -> None:
-        (background := pygame.Surface(self.size, SRCALPHA)).fill((255, 255, 255, 40))
-        self.manager.screen.blit(background, self.pos)
-        pygame.draw.rect(self.manager.screen, (0, 0, 0), (*self.pos, *self.size), 3)
-        pygame.draw.line(self.manager.screen, (0, 0, 0), self.pos + (190, 0), self.pos + (190, self.size.y - 1), 3)
-        for i, data in enumerate(self.data):
-            if "self" in data:
-                pygame.draw.polygon(self.manager.screen, (0, 0, 0), [self.pos + (-7, 16 + i * 26), self.pos + (-17, 16 + i * 26 - 5), self.pos + (-17, 16 + i * 26 + 5)])
-            text_surf = FONT[20].render(data["name"], True, (0, 0, 0))
-            self.manager.screen.blit(text_surf, self.pos + (8, 1 + i * 26))
-            text_surf = FONT[20].render(str(data["score"]), True, (0, 0, 0))
-            self.manager.screen.blit(text_surf, self.pos + (198, 1 + i * 26))
-            if i == len(self.data) - 1: continue
-            pygame.draw.line(self.manager.screen, (0, 0, 0), self.pos + (0, 3 + (i + 1) * 26), self.pos + (self.size.x - 1, 3 + (i + 1) * 26), 3)
\ No newline at end of file
+        rows = tuple((data["name"], data["score"], "self" in data) for data in self.data)
+        self.manager.screen.fblits(self.board.get((int(self.size.x), int(self.size.y)), rows))
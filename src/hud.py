@@ -0,0 +1,20 @@
+from typing import Callable
+import pygame
+
+# The HUD mostly shows values that change at most once a second, so each piece of it keeps the
+# blits it's made of and only renders them again when what it shows changes
+
+Blits = list[tuple[pygame.Surface, tuple[int, int]]]
+
+class Widget:
+    def __init__(self, render: Callable[..., Blits]) -> None:
+        self.render = render # Takes the widget's inputs, returns the surfaces it's made of and where on screen they go
+        self.inputs = None
+        self.blits = []
+
+    def get(self, *inputs) -> Blits:
+        # (surface, position) pairs ready for Surface.fblits, in drawing order
+        if inputs != self.inputs:
+            self.inputs = inputs
+            self.blits = self.render(*inputs)
+        return self.blits
@@ -9,12 +9,16 @@ import opensimplex as noise
 import pygame
 import time
 
-from .constants import TILE_SIZE, WIDTH, VEC, HEIGHT, FONT, TEXT_COLOR
+from .constants import TILE_SIZE, WIDTH, VEC, HEIGHT, TEXT_COLOR, FPS, MENU_FPS, render_text
 from .ground import Ground1Manager, Ground2Manager, Ground3Manager
-from .snowflake import SnowFlake, SnowflakeRenderer
+from .snowflake import SnowflakeRenderer
 from .vignette import FrostVignette, ElimVignette
 from .game_leaderboard import GameLeaderboard
-from .sprite import VisibleSprite, Layers
+from .hud import Widget, Blits
+from .sprite import PooledSprite, Layers
+from .swirl import Swirl, VortexSwirl, SwirlDots
+from .vortex_field import VortexField
+from .powerup import Powerup
 from .player import Player
 from .border import Border
 from .utils import clamp
@@ -31,10 +35,7 @@ class MainGame(Scene):
 
         self.waiting = True
         self.eliminated = False
-        self.client.restart()
-        self.seed = -1
-        while self.seed == -1:
-            time.sleep(0.01)
+        self.connect()
         noise.seed(self.seed)
 
         seed(self.seed)
@@ -44,20 +45,27 @@ class MainGame(Scene):
         seed()
 
         self.leaderboard = GameLeaderboard(self)
+        self.score_hud = Widget(self.render_score)
+        self.time_hud = Widget(self.render_time_left)
+        self.warning_hud = Widget(self.render_warning)
+        self.powerup_hud = Widget(self.render_powerup)
 
         Border(self, -1)
         Border(self, 1)
 
         self.player = Player(self)
+        self.camera = self.player.camera
         self.frost_vignette = FrostVignette(self)
         self.elim_vignette = ElimVignette(self)
+        self.swirl_dots = SwirlDots(self)
+        self.vortex_field = VortexField(self)
+        # Rendering the swirl animations takes a moment, better here than on the first vortex snowball
+        Swirl.get_frames(64)
+        Swirl.get_frames(52)
 
         self.snowflake_time = time.time()
-        self.snowflake_renderer1 = SnowflakeRenderer(self, Layers.SNOWFLAKE1)
-        self.snowflake_renderer2 = SnowflakeRenderer(self, Layers.SNOWFLAKE2)
-        self.snowflake_renderer3 = SnowflakeRenderer(self, Layers.SNOWFLAKE3)
-        for _ in range(1000):
-            SnowFlake(self, VEC(randint(0 - 1000, WIDTH + 1000), randint(-400, HEIGHT)) + self.player.camera.offset)
+        self.snowflake_renderers = [SnowflakeRenderer(self, layer) for layer in [Layers.SNOWFLAKE1, Layers.SNOWFLAKE2, Layers.SNOWFLAKE3]]
+        self.spawn_initial_snowflakes()
 
         self.wind_vel = VEC(0, 0)
         self.time_left = None
@@ -138,6 +146,31 @@ class MainGame(Scene):
         self.q_anim_timer = 0
         self.page2 = False
 
+    def connect(self) -> None:
+        # Blocks until the server has sent the world seed
+        self.client.restart()
+        self.seed = -1
+        while self.seed == -1:
+            time.sleep(0.01)
+
+    def get_target_fps(self) -> int:
+        return MENU_FPS if self.waiting else FPS
+
+    def get_viewport(self) -> pygame.Rect:
+        return pygame.Rect(self.camera.offset, (WIDTH, HEIGHT))
+
+    def get_debug_state(self) -> dict:
+        return super().get_debug_state() | {
+            "waiting": self.waiting,
+            "other_players": len(self.manager.other_players),
+            "snowballs": len(self.player.snowballs),
+            "other_snowballs": sum(len(player.snowballs) for player in list(self.manager.other_players.values())),
+            "snowflakes": sum(len(renderer) for renderer in self.snowflake_renderers),
+            "vortices": len(VortexSwirl.instances),
+            "powerups": len(Powerup.instances),
+            "player_powerup": self.player.powerup,
+        }
+
     def update(self) -> None:
         if self.waiting:
             if pygame.MOUSEBUTTONDOWN in self.manager.events:
@@ -164,7 +197,7 @@ class MainGame(Scene):
 
         if time.time() - self.snowflake_time > 0.05:
             self.snowflake_time = time.time()
-            for _ in range(5):
+            for _ in range(self.manager.quality.get(2, 3, 5)):
                 # choose between above left and right so that we can have snowflakes coming in from the side
                 # and also so that when we move to the left or right we don't get empty air with no snowflakes
                 pos = choice([
@@ -172,7 +205,7 @@ class MainGame(Scene):
                     VEC(randint(-600, -20), randint(-100, HEIGHT)), # Left
                     VEC(randint(WIDTH, WIDTH + 600), randint(-100, HEIGHT)) # Right
                 ])
-                SnowFlake(self, pos + self.player.camera.offset)
+                self.spawn_snowflake(pos + self.player.camera.offset)
 
         if self.time_left is not None:
             self.total_time = max(self.total_time, self.time_left)
@@ -191,45 +224,31 @@ class MainGame(Scene):
         self.client.queue_data("score", self.score)
 
     def draw(self) -> None:
+        self.camera.interpolate(self.manager.alpha)
         self.manager.screen.blit(assets.background, (0, 0))
 
         super().draw()
 
+        # Shading past the borders, blits are clipped to the screen so only the part in view is touched
         screen_x = int(Border.x - self.player.camera.offset.x)
-        for i, x in enumerate(range(screen_x, WIDTH, 15)):
-            self.manager.screen.fill((0, min(255, 20 + i * 2), min(255, 20 + i * 2)), (x, 0, 15, HEIGHT), special_flags=pygame.BLEND_SUB)
+        if screen_x < WIDTH:
+            self.manager.screen.blit(assets.danger_zone, (screen_x, 0), special_flags=pygame.BLEND_RGB_SUB)
+            if (end := screen_x + assets.danger_zone.width) < WIDTH:
+                self.manager.screen.fill(assets.DANGER_ZONE_END, (end, 0, WIDTH - end, HEIGHT), special_flags=pygame.BLEND_RGB_SUB)
         screen_x = int(-Border.x + assets.border.width - self.player.camera.offset.x)
-        for i, x in enumerate(range(screen_x - 15, -30, -15)):
-            self.manager.screen.fill((0, min(255, 20 + i * 2), min(255, 20 + i * 2)), (x, 0, 15, HEIGHT), special_flags=pygame.BLEND_SUB)
-
-        self.manager.screen.blit(FONT[60].render(f"Score: {self.score}", False, TEXT_COLOR), (20, 0))
-        text = FONT[60].render(f"Score: {self.score}", False, TEXT_COLOR)
-        text.set_alpha(70)
-        self.manager.screen.blit(text, VEC(20, 0) + (3, 3))
+        if screen_x > 0:
+            self.manager.screen.blit(assets.danger_zone_left, (screen_x - assets.danger_zone_left.width, 0), special_flags=pygame.BLEND_RGB_SUB)
+            if (start := screen_x - assets.danger_zone_left.width) > 0:
+                self.manager.screen.fill(assets.DANGER_ZONE_END, (0, 0, start, HEIGHT), special_flags=pygame.BLEND_RGB_SUB)
 
+        hud = [*self.score_hud.get(self.score)]
         if self.time_left is not None:
-            text_str = f"Time Left: {max(self.time_left // 60, 0)}:{'0' if self.time_left % 60 < 10 else ''}{self.time_left % 60}"
-            text = FONT[30].render(text_str, False, TEXT_COLOR)
-            text.set_alpha(70)
-            self.manager.screen.blit(text, VEC(20, 72) + (3, 3))
-            text = FONT[30].render(text_str, False, TEXT_COLOR)
-            self.manager.screen.blit(text, (20, 72))
-
-        if self.elim_vignette.flashing and not self.eliminated:
-            text = FONT[20].render("You have the least number of points and may be eliminated soon.", False, (255, 0, 0))
-            self.manager.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 50))
-        elif self.eliminated:
-            text = FONT[32].render("You've been eliminated :(", False, (255, 0, 0))
-            self.manager.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))
-
+            hud += self.time_hud.get(self.time_left)
+        if self.elim_vignette.flashing or self.eliminated:
+            hud += self.warning_hud.get(self.eliminated)
         if self.player.powerup is not None:
-            text_str = f"{self.player.powerup} - {int(self.player.powerup_max_time - (time.time() - self.player.powerup_time))} seconds remaining"
-            text = FONT[30].render(text_str, False, TEXT_COLOR)
-            text.set_alpha(70)
-            self.manager.screen.blit(text, VEC(WIDTH // 2 - text.get_width() // 2 + 30, HEIGHT - 100) + (3, 3))
-            text = FONT[30].render(text_str, False, TEXT_COLOR)
-            self.manager.screen.blit(text, VEC(WIDTH // 2 - text.get_width() // 2 + 30, HEIGHT - 100))
-            self.manager.screen.blit(pygame.transform.scale_by(assets.powerup_icons[self.player.powerup], 2), (WIDTH // 2 - text.get_width() // 2 - 34, HEIGHT - 100))
+            hud += self.powerup_hud.get(self.player.powerup, int(self.player.powerup_max_time - (time.time() - self.player.powerup_time)))
+        self.manager.screen.fblits(hud)
 
         if self.waiting:
             self.draw_waiting_text()
@@ -244,9 +263,7 @@ class MainGame(Scene):
                     self.q_anim_timer = 0
 
             if self.q_anim_timer > 0:
-                trans_surf = pygame.Surface((WIDTH, HEIGHT))
-                trans_surf.fill((255 - self.q_anim_timer * 150,) * 3)
-                self.manager.screen.blit(trans_surf, (0, 0), special_flags=pygame.BLEND_MULT)
+                self.manager.screen.fill((255 - self.q_anim_timer * 150,) * 3, special_flags=pygame.BLEND_MULT)
                 if not self.page2 and self.show_instru:
                     assets.instruction1.set_alpha(int(self.q_anim_timer * 255))
                     self.manager.screen.blit(assets.instruction1, (WIDTH // 2 - assets.instruction1.get_width() // 2, HEIGHT // 2 - assets.instruction1.get_height() // 2))
@@ -257,62 +274,110 @@ class MainGame(Scene):
             pygame.draw.circle(self.manager.screen, (255, 255, 255), (WIDTH, HEIGHT), 100)
             pygame.draw.circle(self.manager.screen, (0, 0, 0), (WIDTH, HEIGHT), 100, 6)
             if not self.show_instru:
-                text = FONT[50].render("?", False, (0, 0, 0))
+                text = render_text(50, "?", False, (0, 0, 0))
                 self.manager.screen.blit(text, (WIDTH - text.width - 18, HEIGHT - text.height - 9))
             elif not self.page2:
-                text = FONT[40].render(">>", False, (0, 0, 0))
+                text = render_text(40, ">>", False, (0, 0, 0))
                 self.manager.screen.blit(text, (WIDTH - text.width - 12, HEIGHT - text.height - 9))
             else:
-                text = FONT[40].render("OK", False, (0, 0, 0))
+                text = render_text(40, "OK", False, (0, 0, 0))
                 self.manager.screen.blit(text, (WIDTH - text.width - 12, HEIGHT - text.height - 9))
 
+        self.camera.restore()
+
+    def render_score(self, score: int) -> Blits:
+        return [
+            (render_text(60, f"Score: {score}", False, TEXT_COLOR), (20, 0)),
+            (render_text(60, f"Score: {score}", False, TEXT_COLOR, 70), (23, 3)),
+        ]
+
+    def render_time_left(self, time_left: int) -> Blits:
+        text_str = f"Time Left: {max(time_left // 60, 0)}:{'0' if time_left % 60 < 10 else ''}{time_left % 60}"
+        return [
+            (render_text(30, text_str, False, TEXT_COLOR, 70), (23, 75)),
+            (render_text(30, text_str, False, TEXT_COLOR), (20, 72)),
+        ]
+
+    def render_warning(self, eliminated: bool) -> Blits:
+        if eliminated:
+            text = render_text(32, "You've been eliminated :(", False, (255, 0, 0))
+            return [(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 80))]
+        text = render_text(20, "You have the least number of points and may be eliminated soon.", False, (255, 0, 0))
+        return [(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT - 50))]
+
+    def render_powerup(self, powerup: str, seconds: int) -> Blits:
+        text_str = f"{powerup} - {seconds} seconds remaining"
+        text = render_text(30, text_str, False, TEXT_COLOR)
+        x = WIDTH // 2 - text.get_width() // 2
+        return [
+            (render_text(30, text_str, False, TEXT_COLOR, 70), (x + 33, HEIGHT - 97)),
+            (text, (x + 30, HEIGHT - 100)),
+            (pygame.transform.scale_by(assets.powerup_icons[powerup], 2), (x - 34, HEIGHT - 100)),
+        ]
+
     def draw_waiting_text(self) -> None:
-        text = FONT[54].render("Waiting for game to start...", False, (0, 0, 0))
+        text = render_text(54, "Waiting for game to start...", False, (0, 0, 0))
         self.manager.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
 
+    def spawn_initial_snowflakes(self) -> None:
+        for _ in range(self.manager.quality.get(400, 700, 1000)):
+            self.spawn_snowflake(VEC(randint(0 - 1000, WIDTH + 1000), randint(-400, HEIGHT)) + self.player.camera.offset)
+
+    def spawn_snowflake(self, pos: VEC) -> None:
+        choice(self.snowflake_renderers).spawn(pos)
+
     def spawn_hit_text(self, pos: VEC, score: int) -> None:
-        HitText(self, pos, score)
+        HitText.spawn(self, pos, score)
 
-class HitText(VisibleSprite):
+class HitText(PooledSprite):
     hittexts = []
 
     def __init__(self, scene: MainGame, pos: VEC, score: int) -> None:
         super().__init__(scene, Layers.GUI)
-        self.pos = pos
+        self.reset(pos, score)
+
+    @classmethod
+    def spawn(cls, scene: MainGame, pos: VEC, score: int) -> HitText:
+        # Texts close to one of the same colour are added onto it, checked before a sprite is taken or added
+        for text in cls.hittexts:
+            if text.pos.distance_to(pos) < 50 and text.color == cls.get_color(score):
+                text.set_score(text.score + score)
+                return text
+        return super().spawn(scene, pos, score)
+
+    @staticmethod
+    def get_color(score: int) -> tuple[int, int, int]:
+        return (10, 140, 30) if score > 0 else (180, 20, 40)
+
+    def reset(self, pos: VEC, score: int) -> None:
+        self.pos = VEC(pos) # Copied, the position passed in is often a snowball's that gets recycled
         self.score = score
-        self.color = (10, 140, 30) if score > 0 else (180, 20, 40)
+        self.color = self.get_color(score)
         self.alpha = 255
         self.font_size = 32
-        self.image = FONT[self.font_size].render(f"{self.score}", False, self.color)
-        self.image.set_alpha(self.alpha)
-
-        for text in self.hittexts:
-            if text.pos.distance_to(self.pos) < 50 and text.color == self.color:
-                text.set_score(text.score + self.score)
-                super().kill()
-                return
-
+        self.image = render_text(self.font_size, f"{self.score}", False, self.color)
         self.hittexts.append(self)
 
     def update(self) -> None:
         self.alpha -= 150 * self.scene.manager.dt
         if self.alpha < 0:
             self.kill()
-        else:
-            self.image.set_alpha(self.alpha)
 
     def set_score(self, score: int) -> None:
         self.score = score
         self.font_size += int(min(abs(score), 5))
         if self.font_size > 127:
             self.font_size = 127
-        self.image = FONT[self.font_size].render(f"{self.score}", False, self.color)
+        self.image = render_text(self.font_size, f"{self.score}", False, self.color)
         self.alpha = 255
 
     def draw(self) -> None:
         pos = self.pos - VEC(self.image.size) // 2 - self.scene.player.camera.offset
         pos = clamp(pos, VEC(40, 40), VEC(WIDTH - 40, HEIGHT - 40))
+        # The image is shared with the text cache, so the fade is only set for this blit
+        self.image.set_alpha(self.alpha)
         self.scene.manager.screen.blit(self.image, pos)
+        self.image.set_alpha(None)
 
     def kill(self) -> None:
         self.hittexts.remove(self)
@@ -1,16 +1,20 @@
 from pygame.locals import *
 from enum import Enum
 import asyncio
+from time import perf_counter
 import pygame
 import sys
 
-from .constants import WIDTH, HEIGHT, FPS
+from .constants import WIDTH, HEIGHT, TICK_RATE, MAX_FRAME_TIME, SPIKE_BUDGET, HEADLESS
 from .start_menu import StartMenu
 from .main_game import MainGame
-from .profiling import profile
+from .pacing import FramePacer, Pacing
+from .quality import QualityGovernor
+from .profiling import profile, FrameStats, SpikeRecorder
 from .end_menu import EndMenu
 from .client import Client
 from .sprite import Layers
+from .utils import get_arg
 from .scene import Scene
 from . import assets
 
@@ -22,44 +26,131 @@ class GameManager:
     def __init__(self) -> None:
         pygame.init()
         pygame.key.set_repeat(500, 25)
-        pygame.mouse.set_cursor((19, 19), assets.crosshair)
+        self.headless = HEADLESS
+        self.draw_enabled = not (self.headless and "--no-draw" in sys.argv)
+        if not self.headless:
+            pygame.mouse.set_cursor((19, 19), assets.crosshair)
 
         self.client = Client(self)
 
         self.flags = HWSURFACE | DOUBLEBUF | RESIZABLE | SCALED | FULLSCREEN
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT), self.flags)
-        self.clock = pygame.time.Clock()
-        self.dt = self.clock.tick_busy_loop(FPS) / 1000
-        self.window_changing = False
         self.events = []
+        # Pacing can be picked with --pacing=busy/sleep/vsync and cycled through in game with F9
+        if (pacing := get_arg("--pacing", "sleep").upper()) not in Pacing.__members__:
+            print(f"Unknown pacing '{pacing.lower()}', expected busy/sleep/vsync, using sleep")
+            pacing = "SLEEP"
+        self.pacer = FramePacer(self, Pacing[pacing])
+        self.create_window()
+        self.dt = 0
+        self.window_changing = False
+        # With --fixed-step the scene is simulated at TICK_RATE no matter the frame rate and drawn interpolated
+        self.fixed_step = "--fixed-step" in sys.argv
+        self.accumulator = 0
+        self.alpha = 1 # How far between the previous and current simulation step the frame is drawn
+        self.carried_events = None # Input events of frames that didn't run a simulation step
+        self.frame_stats = FrameStats()
+        # --capture-spikes (or F4) saves the frames leading up to any frame over --spike-budget=<ms> to profiles/
+        self.spike_recorder = SpikeRecorder(float(get_arg("--spike-budget", SPIKE_BUDGET)) / 1000)
+        self.spike_recorder.enabled = "--capture-spikes" in sys.argv
+        self.frame_stats.enabled = self.spike_recorder.enabled
+        # Effects scale back when frames get slow, unless a fixed --quality=low/medium/high is given
+        self.quality = QualityGovernor(get_arg("--quality", "auto"))
         self.other_players = {}
         self.scene = StartMenu(self, None)
         self.ready = False
 
     def run(self) -> None:
         while self.scene.running:
+            frame_start = perf_counter()
             self.update()
             try:
-                if K_F12 in self.key_downs:
+                start = perf_counter()
+                if self.fixed_step:
+                    self.update_fixed()
+                elif K_F12 in self.key_downs:
                     profile(self.scene.update)
                 else:
                     self.scene.update()
-                if K_F11 in self.key_downs:
-                    profile(self.scene.draw)
-                else:
-                    self.scene.draw()
+                if self.frame_stats.enabled:
+                    self.frame_stats.add("update", "scene", type(self.scene).__name__, perf_counter() - start)
+                if self.draw_enabled:
+                    start = perf_counter()
+                    if K_F11 in self.key_downs:
+                        profile(self.scene.draw)
+                    else:
+                        self.scene.draw()
+                    if self.frame_stats.enabled:
+                        self.frame_stats.add("draw", "scene", type(self.scene).__name__, perf_counter() - start)
             except AbortScene:
                 pass
+            work_time = perf_counter() - frame_start - self.pacer.wait_time
+            self.quality.record(work_time)
+            if self.frame_stats.enabled:
+                if self.spike_recorder.enabled:
+                    self.spike_recorder.record(work_time, self.frame_stats.frame, self.scene)
+                self.frame_stats.end_frame()
+                if self.frame_stats.visible and self.draw_enabled:
+                    self.frame_stats.draw(self.screen)
+
+    def update_fixed(self) -> None:
+        frame_dt = self.dt
+        step = 1 / TICK_RATE
+        if self.carried_events is not None:
+            # Events from frames without a step are merged in so that clicks and key presses aren't dropped
+            events, key_downs, key_ups = self.carried_events
+            self.events = events | self.events
+            self.key_downs = key_downs | self.key_downs
+            self.key_ups = key_ups | self.key_ups
+            self.carried_events = None
+
+        self.accumulator = min(self.accumulator + frame_dt, MAX_FRAME_TIME)
+        stepped = False
+        while self.accumulator >= step:
+            self.accumulator -= step
+            self.dt = step
+            if K_F12 in self.key_downs:
+                profile(self.scene.update)
+            else:
+                self.scene.update()
+            # Input events only belong to the first step, or a click would throw several snowballs
+            if not stepped:
+                stepped = True
+                self.events, self.key_downs, self.key_ups = {}, {}, {}
+        if not stepped:
+            self.carried_events = (self.events, self.key_downs, self.key_ups)
+
+        self.alpha = self.accumulator / step
+        self.dt = frame_dt
+
+    def create_window(self) -> None:
+        if self.headless: # Scenes still draw to the offscreen surface unless drawing is disabled
+            if self.pacer.pacing == Pacing.VSYNC:
+                self.pacer.set_pacing(Pacing.SLEEP)
+            self.screen = pygame.Surface((WIDTH, HEIGHT))
+            return
+        try:
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), self.flags, vsync=self.pacer.pacing == Pacing.VSYNC)
+        except pygame.error: # Vsync isn't supported by every driver
+            print("Vsync unavailable, falling back to sleep pacing")
+            self.pacer.set_pacing(Pacing.SLEEP)
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT), self.flags)
+
+    def set_pacing(self, pacing: Pacing) -> None:
+        vsync_changed = (pacing == Pacing.VSYNC) != (self.pacer.pacing == Pacing.VSYNC)
+        self.pacer.set_pacing(pacing)
+        if vsync_changed:
+            self.create_window()
+            self.window_changing = True
 
     def update(self) -> None:
-        self.dt = self.clock.tick_busy_loop(FPS) / 1000
+        self.dt = self.pacer.tick()
         # Window changing events only register to the DT the frame after the event
         # Thus the window changing variable is "sustained" to the next frame, and handled here
         if self.window_changing:
             self.dt = 0
             self.window_changing = False
 
-        pygame.display.set_caption(f"Blizzard Bash | FPS: {round(self.clock.get_fps())}")
+        pygame.display.set_caption(f"Blizzard Bash | FPS: {round(self.pacer.get_fps())} | {self.pacer.pacing.name.lower()} pacing, jitter {self.pacer.get_jitter():.1f}ms | {self.quality.level.name.lower()} quality")
 
         self.events = {event.type: event for event in pygame.event.get()}
         self.key_downs = {event.key: event for event in self.events.values() if event.type == KEYDOWN}
@@ -68,11 +159,22 @@ class GameManager:
 
         if QUIT in self.events:
             self.quit()
+        if K_F3 in self.key_downs:
+            self.frame_stats.visible = not self.frame_stats.visible
+            self.frame_stats.reset()
+        if K_F4 in self.key_downs:
+            self.spike_recorder.enabled = not self.spike_recorder.enabled
+            print(f"Spike capture {'enabled' if self.spike_recorder.enabled else 'disabled'}")
+        self.frame_stats.enabled = self.frame_stats.visible or self.spike_recorder.enabled
+        if K_F9 in self.key_downs:
+            pacings = list(Pacing)
+            self.set_pacing(pacings[(pacings.index(self.pacer.pacing) + 1) % len(pacings)])
         if WINDOWRESIZED in self.events or WINDOWMOVED in self.events:
             self.window_changing = True
             self.dt = 0
 
-        pygame.display.flip()
+        if not self.headless:
+            self.pacer.present()
 
     def quit(self) -> None:
         self.client.running = False
@@ -9,15 +9,19 @@ from math import sin, pi
 import pygame
 import time
 
-from .constants import VEC, FONT, PIXEL_SIZE, WIDTH
+from .constants import VEC, PIXEL_SIZE, WIDTH, render_text
 from .ground import Ground1, Ground2, Ground3
-from .sprite import VisibleSprite, Layers
+from .sprite import VisibleSprite, PooledSprite, Layers
 from .swirl import Swirl, VortexSwirl
-from .utils import shadow
+from .utils import get_shadow
 from .aura import Aura
 from . import assets
 
 class OtherPlayer(VisibleSprite):
+    interpolated = True
+    default_assets = None # Shared by every player whose colours haven't come in from the server yet
+    glow_colors = [(63, 134, 165), (233, 86, 86), (88, 210, 103), (204, 102, 255)] # By powerup index, -1 is no powerup
+
     def __init__(self, scene: Scene, _id: int, pos: tuple[int, int]) -> None:
         super().__init__(scene, Layers.PLAYER1)
         self.id = _id
@@ -27,10 +31,11 @@ class OtherPlayer(VisibleSprite):
         self.clothes_hue = 135
         self.hat_hue = 0
         self.skin_tone = 230
-        self.assets = assets
+        if __class__.default_assets is None:
+            __class__.default_assets = assets.PlayerAssets(self.clothes_hue, self.hat_hue, self.skin_tone)
+        self.assets = __class__.default_assets
         self.orig_image = self.assets.player[self.frame]
-        self.upright_image = self.orig_image
-        self.image = self.upright_image
+        self.image = self.orig_image
         self.rect = pygame.Rect(self.pos, self.size)
         self.real_rect = self.rect.copy()
         self.real_rect.size = (10 * PIXEL_SIZE, 20 * PIXEL_SIZE)
@@ -55,21 +60,14 @@ class OtherPlayer(VisibleSprite):
             y2 = Ground2.height_map[centerx]
             y3 = Ground3.height_map[centerx]
             if self.pos.y < y3 + 12 and y2 > y3 and self._layer != Layers.PLAYER3:
-                self.scene.sprite_manager.remove(self)
-                self._layer = Layers.PLAYER3
-                self.scene.sprite_manager.add(self)
+                self.scene.sprite_manager.move(self, Layers.PLAYER3)
             elif y3 + 12 < self.pos.y < y2 + 12 and self._layer != Layers.PLAYER2:
-                self.scene.sprite_manager.remove(self)
-                self._layer = Layers.PLAYER2
-                self.scene.sprite_manager.add(self)
+                self.scene.sprite_manager.move(self, Layers.PLAYER2)
             elif y2 + 12 < self.pos.y < y1 + 12 and self._layer != Layers.PLAYER1:
-                self.scene.sprite_manager.remove(self)
-                self._layer = Layers.PLAYER1
-                self.scene.sprite_manager.add(self)
+                self.scene.sprite_manager.move(self, Layers.PLAYER1)
 
             self.orig_image = self.assets.player[self.frame]
-            self.upright_image = pygame.transform.flip(self.orig_image, self.flip, False)
-            self.image = pygame.transform.rotate(self.upright_image, self.rotation % 360)
+            self.image = self.assets.get_frame(self.frame, self.flip, self.rotation)
 
             if self.powerup == 3:
                 for snowball in self.scene.player.snowballs.values():
@@ -90,17 +88,24 @@ class OtherPlayer(VisibleSprite):
         self.skin_tone = skin
         self.assets = assets.PlayerAssets(clothes, hat, skin)
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        # Leaves room for the shadow, the powerup glow and the score and name labels above the player
+        return pygame.Rect(self.rect.left - 100, self.rect.top - 80, self.rect.width + 200, self.rect.height + 90)
+
     def draw(self) -> None:
         try:
-            if self.rect.right - self.scene.player.camera.offset.x < -20 or self.rect.left - self.scene.player.camera.offset.x > WIDTH + 20: return
-
-            self.manager.screen.blit(shadow(self.image), VEC(self.rect.topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
-
-            if self.powerup != -1:
-                color = [(63, 134, 165), (233, 86, 86), (88, 210, 103), (204, 102, 255)][self.powerup]
+            if self.manager.quality.get(False, True, True):
+                shadow_img = get_shadow(self.orig_image, self.flip, self.rotation)
+                self.manager.screen.blit(shadow_img, VEC(shadow_img.get_rect(center=self.rect.center).topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+
+            # The glow is only looked up while a powerup is active, so nothing else in draw depends on it
+            glow = 0 <= self.powerup < len(self.glow_colors) and self.manager.quality.get(False, True, True)
+            if glow:
+                color = self.glow_colors[self.powerup]
                 alpha = (sin((time.time() - self.powerup_flash_time) * pi * 3) * 0.5 + 0.5) * 255
-                mask = pygame.mask.from_surface(self.image)
-                powerup_overlay = mask.scale(VEC(mask.get_size()) + (20, 14)).to_surface(setcolor=(*color, alpha), unsetcolor=(0, 0, 0, 0))
+                powerup_overlay = self.assets.get_glow(self.frame, self.flip, self.rotation, color)
+                powerup_overlay.set_alpha(alpha)
                 self.manager.screen.blit(powerup_overlay, VEC(self.rect.topleft) - (10, 7) - self.scene.player.camera.offset)
 
             if self.powerup == 3 and self.aura is None:
@@ -111,21 +116,19 @@ class OtherPlayer(VisibleSprite):
 
             self.manager.screen.blit(self.image, VEC(self.rect.topleft) - self.scene.player.camera.offset)
 
-            if self.powerup != -1:
-                powerup_overlay.set_alpha(100)
+            if glow:
+                powerup_overlay.set_alpha(alpha * 100 / 255)
                 self.manager.screen.blit(powerup_overlay, VEC(self.rect.topleft) - (10, 7) - self.scene.player.camera.offset)
 
-            text = FONT[28].render(f"{self.score}", False, (0, 0, 0))
+            text = render_text(28, f"{self.score}", False, (0, 0, 0))
             pos = VEC(self.rect.midtop) - (text.get_width() // 2, text.get_height() + 5)
-            text_shadow = FONT[28].render(f"{self.score}", False, (0, 0, 0))
-            text_shadow.set_alpha(70)
+            text_shadow = render_text(28, f"{self.score}", False, (0, 0, 0), 70)
             self.manager.screen.blit(text_shadow, pos + (3, 3) - self.scene.player.camera.offset)
             self.manager.screen.blit(text, pos - self.scene.player.camera.offset)
 
-            text = FONT[20].render(f"{self.name}", False, (0, 0, 0))
+            text = render_text(20, f"{self.name}", False, (0, 0, 0))
             pos = VEC(self.rect.midtop) - (text.get_width() // 2, text.get_height() + 40)
-            text_shadow = FONT[20].render(f"{self.name}", False, (0, 0, 0))
-            text_shadow.set_alpha(70)
+            text_shadow = render_text(20, f"{self.name}", False, (0, 0, 0), 70)
             self.manager.screen.blit(text_shadow, pos + (3, 3) - self.scene.player.camera.offset)
             self.manager.screen.blit(text, pos - self.scene.player.camera.offset)
         except Exception as e:
@@ -169,16 +172,22 @@ class OtherArrow(VisibleSprite):
         except Exception as e:
             print(e)
 
-class OtherSnowball(VisibleSprite):
+class OtherSnowball(PooledSprite):
+    interpolated = True
     # Sometimes snowball data can get sent marginally after the snowball is killed, this set is used to prevent that data from being processed
     killed = set()
 
     def __init__(self, scene: Scene, id: str, pos: tuple[int, int], frame: int, type: int) -> None:
         super().__init__(scene, Layers.SNOWBALL)
+        self.pos = VEC(0, 0)
+        self.reset(id, pos, frame, type)
+
+    def reset(self, id: str, pos: tuple[int, int], frame: int, type: int) -> None:
         self.id = id
-        self.pos = VEC(pos)
+        self.pos.update(pos)
         self.frame = frame
         self.type = type
+        self.swirl = None
         if self.type == 2:
             self.swirl = Swirl(self.scene, Layers.SNOWBALL, 64)
         self.frames = assets.snowball_small if type in {0, 3, 5} else assets.snowball_large
@@ -195,10 +204,14 @@ class OtherSnowball(VisibleSprite):
         except Exception as e:
             print(e)
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return self.rect.inflate(6, 6)
+
     def draw(self) -> None:
         try:
-            if self.rect.right - self.scene.player.camera.offset.x < -20 or self.rect.left - self.scene.player.camera.offset.x > WIDTH + 20: return
-            self.manager.screen.blit(shadow(self.image), VEC(self.rect.topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+            if self.manager.quality.get(False, True, True):
+                self.manager.screen.blit(get_shadow(self.image), VEC(self.rect.topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
             self.manager.screen.blit(self.image, VEC(self.rect.topleft) - self.scene.player.camera.offset)
         except Exception as e:
             print(e)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from manager import GameManager
+
+from collections import deque
+from enum import Enum, auto
+from statistics import pstdev
+import pygame
+import time
+
+from .constants import FPS, IDLE_FPS, IDLE_TIME
+
+SPIN_TIME = 0.002 # Sleeping is only accurate to about a millisecond, so the end of each frame is spun instead
+
+class Pacing(Enum):
+    BUSY = auto() # Spin for the whole frame, most accurate but uses up a whole core
+    SLEEP = auto() # Sleep for most of the frame and spin for the last SPIN_TIME
+    VSYNC = auto() # Let display.flip block until the next refresh, see FramePacer.present
+
+class FramePacer:
+    def __init__(self, manager: GameManager, pacing: Pacing) -> None:
+        self.manager = manager
+        self.pacing = pacing
+        self.clock = pygame.time.Clock()
+        self.frame_times = deque(maxlen=120) # Seconds, used for the FPS and jitter readouts
+        self.last = time.perf_counter()
+        self.deadline = self.last
+        self.input_time = time.time()
+        self.wait_time = 0
+
+    def tick(self) -> float:
+        target = self.get_target_fps()
+        wait_start = time.perf_counter()
+        if self.pacing == Pacing.BUSY:
+            self.clock.tick_busy_loop(target)
+        elif self.pacing == Pacing.SLEEP or target < FPS:
+            # Vsync on its own would still present menus at the full refresh rate
+            self.wait(target)
+
+        now = time.perf_counter()
+        self.wait_time = now - wait_start # Time spent idling rather than working on the frame
+        dt = now - self.last
+        self.last = now
+        self.frame_times.append(dt)
+        return dt
+
+    def present(self) -> None:
+        # With vsync the flip blocks until the next refresh, which is the wait for the frame rather than work on it
+        # The flip is counted as waiting either way, the quality governor and the spike recorder only see the game's own work
+        start = time.perf_counter()
+        pygame.display.flip()
+        self.wait_time += time.perf_counter() - start
+
+    def wait(self, target: int) -> None:
+        frame_time = 1 / target
+        # Deadlines are scheduled from the previous deadline rather than from now so that errors don't accumulate
+        self.deadline += frame_time
+        now = time.perf_counter()
+        if self.deadline < now - frame_time: # Fell more than a frame behind, don't try to catch up
+            self.deadline = now
+        if self.deadline - now > SPIN_TIME:
+            time.sleep(self.deadline - now - SPIN_TIME)
+        while time.perf_counter() < self.deadline:
+            pass
+
+    def get_target_fps(self) -> int:
+        target = self.manager.scene.get_target_fps()
+        if self.manager.events:
+            self.input_time = time.time()
+        # Scenes that already run slower than the game (menus, waiting room) drop further when nobody is touching anything
+        if target < FPS and time.time() - self.input_time > IDLE_TIME:
+            target = IDLE_FPS
+        return target
+
+    def set_pacing(self, pacing: Pacing) -> None:
+        self.pacing = pacing
+        self.deadline = time.perf_counter()
+        self.frame_times.clear()
+
+    def get_fps(self) -> float:
+        if not self.frame_times: return 0
+        return len(self.frame_times) / sum(self.frame_times)
+
+    def get_jitter(self) -> float:
+        # Standard deviation of the recent frame times in milliseconds
+        if len(self.frame_times) < 2: return 0
+        return pstdev(self.frame_times) * 1000
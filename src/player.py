@@ -10,12 +10,13 @@ from typing import Optional
 import pygame
 import time
 
-from .utils import intvec, snap, clamp, clamp_max, snap, sign, shadow, inttup
+from .utils import intvec, snap, clamp, clamp_max, snap, sign, get_shadow, inttup
 from .constants import VEC, SCR_DIM, GRAVITY, PIXEL_SIZE, TILE_SIZE
 from .ground import Ground1, Ground2, Ground3
 from .snowball import Snowball, SelfSnowball
 from .sprite import VisibleSprite, Layers
 from .swirl import Swirl, VortexSwirl
+from .trajectory import get_acceleration, get_position, velocity_to_hit
 from .powerup import Powerup
 from .border import Border
 from .aura import Aura
@@ -27,45 +28,85 @@ class Camera:
         self.follow = follow
         self.float_offset = VEC(pos) - SCR_DIM // 2
         self.offset = intvec(self.float_offset)
+        self.prev_offset = self.offset
         self.scene = scene
 
     def update(self, pos: tuple[int, int]):
+        self.prev_offset = self.offset
         self.tick_offset = pos - self.offset - SCR_DIM // 2
         self.tick_offset = snap(self.tick_offset, VEC(), VEC(1, 1))
         self.float_offset += self.tick_offset * self.follow * self.manager.dt
         self.offset = intvec(self.float_offset)
         self.offset.y = max(self.scene.player.pos.y - 650, min(self.offset.y, -420))
 
+    def interpolate(self, alpha: float) -> None:
+        # Swaps in the offset between the previous and current simulation step for drawing, undone by restore
+        self.sim_offset = self.offset
+        self.offset = intvec(self.prev_offset.lerp(self.offset, alpha))
+
+    def restore(self) -> None:
+        self.offset = self.sim_offset
+
 class ThrowTrail(VisibleSprite):
+    # Every dot the trail can draw, by radius and shade
+    dots = {}
+    for i in range(100):
+        r = int((1 - i / 100) * 8)
+        shade = int(i / 100 * 140 + 30)
+        dots[(r, shade)] = pygame.Surface((r * 2 + 1, r * 2 + 1))
+        pygame.draw.aacircle(dots[(r, shade)], (shade,) * 3, (r, r), r, 3)
+    del i, r, shade
+
     def __init__(self, scene: Scene, player: Player) -> None:
         super().__init__(scene, Layers.THROW_TRAIL)
         self.player = player
+        self.inputs = None
+        self.points = [] # (dot, world position of its top left) for every dot drawn
 
     def update(self) -> None:
         ...
 
-    def draw(self) -> None:
-        if not self.player.throwing: return
+    def calculate(self) -> None:
         factor = 0.01 # Basically how accurate we want the calculation to be, the distance factor between two points
-        pos = VEC(self.player.rect.topleft) + self.player.SB_OFFSET
-        vel = self.player.sb_vel.copy()
-        for i in range(100): # Number of points on the parabola that will be calculated
-            for v in VortexSwirl.instances.values():
-                if (dist := pos.distance_to(v.pos + (v.size / 2,) * 2)) < 250 and dist > 0:
-                    vel *= ((dist + 10) / 260) ** self.manager.dt # more friction the closer to center the snowball gets
-                    vel += (1 - dist / 250) * (v.pos + (v.size / 2, v.size / 2) - pos).normalize() * 150 # normal accel (toward center)
-                    vel += (1.1 - dist / 250) * (v.pos + (v.size / 2, v.size / 2) - pos).normalize().rotate(-90) * 10 # tangent accel (perp. to normal)
-
-            vel.y += GRAVITY * factor
-            vel += self.scene.wind_vel * factor
-            pos += vel * factor
-            if i % 3: continue # For every 4 calculated points, we draw 1 point
+        start = VEC(self.player.rect.topleft) + self.player.SB_OFFSET
+        drawn = range(0, 100, self.manager.quality.get(9, 5, 3)) # For every few calculated points, we draw 1 point
+        if not self.scene.vortex_field.ids:
+            # Nothing but gravity and wind, so the drawn points can be worked out directly
+            acc = get_acceleration(self.scene.wind_vel)
+            positions = [get_position(start, self.player.sb_vel, acc, (i + 1) * factor, factor) for i in drawn]
+        else:
+            pos = start
+            vel = self.player.sb_vel.copy()
+            positions = []
+            for i in range(drawn[-1] + 1): # Number of points on the parabola that will be calculated
+                self.scene.vortex_field.pull(pos, vel, self.manager.dt)
+                vel.y += GRAVITY * factor
+                vel += self.scene.wind_vel * factor
+                pos += vel * factor
+                if i in drawn:
+                    positions.append(pos.copy())
+        self.points = []
+        for i, pos in zip(drawn, positions):
             r = int((1 - i / 100) * 8)
-            circle = pygame.Surface((r * 2 + 1, r * 2 + 1))
-            pygame.draw.aacircle(circle, (i / 100 * 140 + 30,) * 3, (r, r), r, 3)
-            self.manager.screen.blit(circle, pos - self.player.camera.offset - (r, r), special_flags=BLEND_RGB_SUB)
+            self.points.append((self.dots[(r, int(i / 100 * 140 + 30))], (pos.x - r, pos.y - r)))
+
+    def draw(self) -> None:
+        if not self.player.throwing: return
+        # The parabola only changes when something it depends on does, the frame time only matters when a vortex pulls on it
+        field = self.scene.vortex_field
+        inputs = (
+            tuple(self.player.sb_vel), tuple(self.scene.wind_vel), self.player.rect.topleft,
+            field.ids, self.manager.dt if field.ids else None, self.manager.quality.level,
+        )
+        if inputs != self.inputs:
+            self.inputs = inputs
+            self.calculate()
+        ox, oy = self.player.camera.offset
+        self.manager.screen.fblits([(dot, (x - ox, y - oy)) for dot, (x, y) in self.points], BLEND_RGB_SUB)
 
 class DigProgress(VisibleSprite):
+    interpolated = True
+
     def __init__(self, scene: Scene, player: Player) -> None:
         super().__init__(scene, Layers.GUI)
         self.player = player
@@ -149,6 +190,8 @@ class DigProgress(VisibleSprite):
                     display.swirl.visible = False
 
 class Player(VisibleSprite):
+    interpolated = True
+
     def __init__(self, scene: Scene) -> None:
         super().__init__(scene, Layers.PLAYER1)
         self.size = VEC(45, 60)
@@ -161,8 +204,7 @@ class Player(VisibleSprite):
         self.skin_tone = self.scene.previous_scene.skin_selector.skin_tone
         self.assets = assets.PlayerAssets(self.clothes_hue, self.hat_hue, self.skin_tone)
         self.orig_image = self.assets.player_idle[0]
-        self.upright_image = self.orig_image
-        self.image = self.upright_image
+        self.image = self.orig_image
         self.rect = pygame.Rect(self.pos, self.size)
         self.real_rect = self.rect.copy()
         self.real_rect.size = (10 * PIXEL_SIZE, 20 * PIXEL_SIZE)
@@ -258,7 +300,7 @@ class Player(VisibleSprite):
         self.client.queue_data("pos", inttup(self.pos))
         self.client.queue_data("rot", int(self.rotation))
         self.client.queue_data("flip", self.flip)
-        self.client.queue_data("frame", self.assets.player.index(self.orig_image))
+        self.client.queue_data("frame", self.assets.index[self.orig_image])
         self.client.queue_data("powerup", ["rapidfire", "strength", "clustershot", "telekinesis"].index(self.powerup) if self.powerup else -1)
         self.client.queue_data("pwrnum", self.collected_powerups)
 
@@ -295,13 +337,16 @@ class Player(VisibleSprite):
         # self.client.queue_data("storm_blobs", storm_blobs)
 
     def draw(self) -> None:
-        self.manager.screen.blit(shadow(self.image), VEC(self.rect.topleft) - self.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+        if self.manager.quality.get(False, True, True):
+            shadow_img = get_shadow(self.orig_image, self.flip, self.rotation)
+            self.manager.screen.blit(shadow_img, VEC(shadow_img.get_rect(center=self.rect.center).topleft) - self.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
 
-        if self.powerup:
+        glow = self.powerup and self.manager.quality.get(False, True, True)
+        if glow:
             color = {"rapidfire": (63, 134, 165), "strength": (233, 86, 86), "clustershot": (88, 210, 103), "telekinesis": (204, 102, 255)}[self.powerup]
             alpha = (sin((time.time() - self.powerup_flash_time) * pi * 3) * 0.5 + 0.5) * 255
-            mask = pygame.mask.from_surface(self.image)
-            powerup_overlay = mask.scale(VEC(mask.get_size()) + (20, 14)).to_surface(setcolor=(*color, alpha), unsetcolor=(0, 0, 0, 0))
+            powerup_overlay = self.assets.get_glow(self.assets.index[self.orig_image], self.flip, self.rotation, color)
+            powerup_overlay.set_alpha(alpha)
             self.manager.screen.blit(powerup_overlay, VEC(self.rect.topleft) - (10, 7) - self.camera.offset)
 
         if self.scene.eliminated:
@@ -309,8 +354,8 @@ class Player(VisibleSprite):
         self.manager.screen.blit(self.image, (*(VEC(self.rect.topleft) - self.camera.offset), *self.size))
         self.image.set_alpha(255)
 
-        if self.powerup:
-            powerup_overlay.set_alpha(100)
+        if glow:
+            powerup_overlay.set_alpha(alpha * 100 / 255)
             self.manager.screen.blit(powerup_overlay, VEC(self.rect.topleft) - (10, 7) - self.camera.offset)
 
     def update_keys(self) -> None:
@@ -394,11 +439,11 @@ class Player(VisibleSprite):
         if self.completely_lag and time.time() - self.lag_time > 0.1:
             self.lag_time = time.time()
             for _ in range(int(self.completely_lag)):
-                sb = Snowball(self.scene, (uniform(-100,100), -1000), 1, VEC())
+                sb = Snowball.spawn(self.scene, (uniform(-100,100), -1000), 1, VEC())
                 self.snowballs[sb.id] = sb
         if self.funny_rapid and self.powerup == "rapidfire" and time.time() - self.lag_time > 0.02:
             self.lag_time = time.time()
-            sb = Snowball(self.scene, (uniform(-1000,1000), -2000), 1, self.pos + VEC(0, -self.size.y / 2))
+            sb = Snowball.spawn(self.scene, (uniform(-1000,1000), -2000), 1, self.pos + VEC(0, -self.size.y / 2))
             self.snowballs[sb.id] = sb
 
         if self.powerup != "rapidfire":
@@ -456,20 +501,20 @@ class Player(VisibleSprite):
                     self.has_trigger = True
                     size = self.pop_snowball()
                     if size == 2:
-                        sb = Snowball(self.scene, self.sb_vel, 2)
+                        sb = Snowball.spawn(self.scene, self.sb_vel, 2)
                         self.snowballs[sb.id] = sb
                         size -= 1
-                    sb = Snowball(self.scene, self.sb_vel, 3 + size)
+                    sb = Snowball.spawn(self.scene, self.sb_vel, 3 + size)
                     self.snowballs[sb.id] = sb
                 elif self.powerup == "rapidfire":
                     if time.time() - self.rapidfire_time > 0.05:
-                        sb = Snowball(self.scene, self.sb_vel, 0)
+                        sb = Snowball.spawn(self.scene, self.sb_vel, 0)
                         self.snowballs[sb.id] = sb
                         self.overheat = min(30, self.overheat + 1)
                         self.rapidfire_time = time.time()
                 else:
                     size = self.pop_snowball()
-                    sb = Snowball(self.scene, self.sb_vel, size + (5 if self.powerup == "telekinesis" and size != 2 else 0))
+                    sb = Snowball.spawn(self.scene, self.sb_vel, size + (5 if self.powerup == "telekinesis" and size != 2 else 0))
                     self.snowballs[sb.id] = sb
                 if self.powerup != "rapidfire":
                     self.dig_iterations -= 3 if (size == 1 or size == 2) else 1
@@ -507,17 +552,11 @@ class Player(VisibleSprite):
             self.ground_level = Ground2
 
         if self.ground_level == Ground1 and self._layer != Layers.PLAYER1:
-            self.scene.sprite_manager.remove(self)
-            self._layer = Layers.PLAYER1
-            self.scene.sprite_manager.add(self)
+            self.scene.sprite_manager.move(self, Layers.PLAYER1)
         elif self.ground_level == Ground2 and self._layer != Layers.PLAYER2:
-            self.scene.sprite_manager.remove(self)
-            self._layer = Layers.PLAYER2
-            self.scene.sprite_manager.add(self)
+            self.scene.sprite_manager.move(self, Layers.PLAYER2)
         elif self.ground_level == Ground3 and self._layer != Layers.PLAYER3:
-            self.scene.sprite_manager.remove(self)
-            self._layer = Layers.PLAYER3
-            self.scene.sprite_manager.add(self)
+            self.scene.sprite_manager.move(self, Layers.PLAYER3)
 
         self.vel += self.acc * self.manager.dt
         # If the absolute value of x vel is less than the constant acceleration, snap to 0 so that deceleration doesn't overshoot
@@ -569,7 +608,7 @@ class Player(VisibleSprite):
         if (self.pos.x > Border.x or self.pos.x < -Border.x) and not self.scene.eliminated:
             if time.time() - self.self_snowball_time > 800 / diff * 0.06:
                 pos = self.pos - (0, 400) - self.scene.wind_vel * 0.25 + (self.vel.x * 0.4, 0) + (uniform(-80, 80), 0)
-                sb = SelfSnowball(self.scene, VEC(0, 0), randint(0, 1), pos=pos, follow=False)
+                sb = SelfSnowball.spawn(self.scene, VEC(0, 0), randint(0, 1), pos=pos, follow=False)
                 self.snowballs[sb.id] = sb
                 self.self_snowball_time = time.time()
 
@@ -597,6 +636,15 @@ class Player(VisibleSprite):
             return self.pos.distance_to(o) < dist
         return abs(self.pos.x - o) < dist
 
+    def get_bot_aim(self, target: VEC) -> VEC:
+        # Screen position to click for a throw to go through target, straight at 45 degrees toward it when it's out of reach
+        start = VEC(self.rect.topleft) + self.SB_OFFSET
+        speed = self.THROW_SPEED * (2 if self.powerup == "strength" else 1)
+        vel = velocity_to_hit(start, target, get_acceleration(self.scene.wind_vel), speed)
+        if vel is None:
+            vel = VEC(sign(target.x - start.x) or 1, -1)
+        return start - self.camera.offset + vel.normalize() * 100
+
     def get_bot_decision(self) -> str:
         min_dist = 99999
         min_snow_dist = 99999
@@ -687,10 +735,7 @@ class Player(VisibleSprite):
                         returning += " a "
                 # try shooting the powerup
                 else:
-                    self.bot_mpos = (tracking_powerup.pos - self.camera.offset)
-                    self.bot_mpos -= VEC(0, abs(tracking_powerup.pos.x - self.pos.x)) / 6
-                    if self.powerup == "strength": # less distance-based adj.
-                        self.bot_mpos += VEC(0, abs(tracking_powerup.pos.x - self.pos.x)) / 10
+                    self.bot_mpos = self.get_bot_aim(tracking_powerup.pos)
                     returning += " click "
                     self.debug_brain += "shooting_powerup "
 
@@ -768,25 +813,16 @@ class Player(VisibleSprite):
             if min_dist < (2000 if self.powerup == "telekinesis" else \
                                 600 if self.powerup == "strength" else \
                                 250 if self.powerup == "rapidfire" else 300):
-                self.bot_mpos = (tracking_player.pos - VEC(0, self.size.y) - self.camera.offset)
-                self.bot_mpos -= VEC(0, abs(tracking_player.pos.x - self.pos.x)) / 6
-
                 self.debug_brain += "in_shooting_range "
 
                 # aim adjustment due to powerups
+                target = tracking_player.pos - VEC(0, self.size.y / 2)
                 if self.powerup == "clustershot": # aim slightly higher
-                    self.bot_mpos -= VEC(0, 15)
-                if self.powerup == "strength": # less distance-based adj.
-                    self.bot_mpos += VEC(0, abs(tracking_player.pos.x - self.pos.x)) / 10
-                    if self.close_to(tracking_player.pos.x, 100):
-                        self.bot_mpos = (tracking_player.pos - VEC(0, self.size.y) - self.camera.offset)
+                    target -= VEC(0, 15)
+                self.bot_mpos = self.get_bot_aim(target)
                 if self.powerup == "telekinesis": # aim a lot higher
                     self.bot_mpos -= VEC(0, 1000)
 
-                # account for wind when target too high
-                if tracking_player.pos.y - self.pos.y < -150 and self.close_to(tracking_player.pos.x, 100):
-                    self.bot_mpos -= VEC(self.scene.wind_vel * 0.1, 0)
-
                 returning += " click "
                 # # too close, move further away
                 # if (min_dist < (0 if self.powerup == "rapidfire" else 150)) and \
@@ -818,7 +854,7 @@ class Player(VisibleSprite):
         self.dig_progress.snowballs_displays.append(self.dig_progress.SnowballDisplay(self.scene, self, size))
 
     def spawn_snowball(self, size: int, pos: tuple[int, int], vel: tuple[int, int], follow: bool = True) -> None:
-        sb = Snowball(self.scene, VEC(vel), size, pos=pos, follow=follow)
+        sb = Snowball.spawn(self.scene, vel, size, pos=pos, follow=follow)
         self.snowballs[sb.id] = sb
 
     def pop_snowball(self) -> int:
@@ -908,8 +944,7 @@ class Player(VisibleSprite):
             self.frame = self.frame_group.length - 1
 
         self.orig_image = self.frame_group[self.frame]
-        self.upright_image = pygame.transform.flip(self.orig_image, self.flip, False)
-        self.image = pygame.transform.rotate(self.upright_image, self.rotation % 360)
+        self.image = self.assets.get_frame(self.assets.index[self.orig_image], self.flip, self.rotation)
 
         self.rect = self.image.get_rect(midbottom=self.pos)
         self.real_rect.midbottom = self.rect.midbottom
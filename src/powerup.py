@@ -7,13 +7,14 @@ from pygame.locals import BLEND_RGB_SUB
 import pygame
 import time
 
-from .constants import VEC, PIXEL_SIZE, WIDTH
+from .constants import VEC, PIXEL_SIZE
 from .sprite import VisibleSprite, Layers
 from .ground import Ground1
 from .utils import shadow
 from . import assets
 
 class Powerup(VisibleSprite):
+    interpolated = True
     instances = {}
 
     def __init__(self, scene: Scene, _id: int, _type: str, pos: tuple[int, int]) -> None:
@@ -64,9 +65,13 @@ class Powerup(VisibleSprite):
             self.client.irreg_data.put({"id": self.id, "powerup": 1}) # powerup key to uniquify the message
             self.touched = True
 
+    @property
+    def world_rect(self) -> pygame.Rect | None:
+        if not hasattr(self, "initialized"): return None
+        return self.rect
+
     def draw(self) -> None:
         if not hasattr(self, "initialized"): return
         while self.image.get_locked(): pass
-        if self.rect.right - self.scene.player.camera.offset.x < -20 or self.rect.left - self.scene.player.camera.offset.x > WIDTH + 20: return
         self.manager.screen.blit(self.shadow_image, self.pos - self.size // 2 - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
         self.manager.screen.blit(self.image, self.pos - self.size // 2 - self.scene.player.camera.offset)
@@ -1,10 +1,23 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from scene import Scene
+
+from collections import defaultdict, deque
+from pygame.locals import SRCALPHA
+from threading import Thread
 from pathlib import Path
 from typing import Any
 import datetime
+import pygame
+import time
 import cProfile
 import pstats
+import json
 import os
 
+from .constants import FONT
+
 def profile(callable: type, *args: tuple) -> Any:
     with cProfile.Profile() as profile: # Profiling the contents of the with block
         returnval = callable(*args)     # Calling the callable with the args
@@ -17,4 +30,104 @@ def profile(callable: type, *args: tuple) -> Any:
     stats.dump_stats(filename=str(statfile)) # Saving the stats to a profile file
     stats.print_stats()                      # Printing the stats
     print(f"\n\n Profile saved to: {str(statfile)}!\n\n")
-    return returnval
\ No newline at end of file
+    return returnval
+
+class FrameStats:
+    # Rolling per-layer and per-sprite-class timings, cheap enough to leave on during a match (toggled with F3)
+    def __init__(self, window: int = 120) -> None:
+        self.enabled = False # Collecting timings, also needed by the spike recorder
+        self.visible = False # Showing the overlay
+        self.window = window # Number of frames the averages and percentiles are taken over
+        self.frame = defaultdict(float) # (pass, kind, name): seconds spent so far this frame
+        self.history: dict[tuple[str, str, str], deque[float]] = {}
+        self.overlay = None
+        self.overlay_time = 0
+
+    def add(self, pass_name: str, kind: str, name: str, seconds: float) -> None:
+        self.frame[(pass_name, kind, name)] += seconds
+
+    def end_frame(self) -> None:
+        for key in self.frame.keys() - self.history.keys():
+            self.history[key] = deque(maxlen=self.window)
+        for key, times in self.history.items():
+            times.append(self.frame.get(key, 0)) # Keys that didn't show up this frame still count as a frame of 0 ms
+        self.frame.clear()
+
+    def reset(self) -> None:
+        self.frame.clear()
+        self.history.clear()
+        self.overlay = None
+
+    def get_summary(self, pass_name: str, kind: str) -> list[tuple[str, float, float]]:
+        # Returns (name, average ms, 95th percentile ms), most expensive first
+        summary = []
+        for (p, k, name), times in self.history.items():
+            if p != pass_name or k != kind: continue
+            ordered = sorted(times)
+            summary.append((name, sum(times) / len(times) * 1000, ordered[int(0.95 * (len(ordered) - 1))] * 1000))
+        summary.sort(key=lambda entry: entry[1], reverse=True)
+        return summary
+
+    def draw(self, screen: pygame.Surface) -> None:
+        # The overlay is only re-rendered a couple times a second, it would be unreadable any faster anyways
+        if self.overlay is None or time.time() - self.overlay_time > 0.5:
+            self.overlay = self.render_overlay()
+            self.overlay_time = time.time()
+        screen.blit(self.overlay, (10, 110))
+
+    def render_overlay(self) -> pygame.Surface:
+        lines = []
+        for pass_name in ["update", "draw"]:
+            lines.append(f"{pass_name} - avg / p95 ms")
+            for name, avg, p95 in self.get_summary(pass_name, "scene"):
+                lines.append(f"  total {name}: {avg:.2f} / {p95:.2f}")
+            for kind in ["layer", "class"]:
+                for name, avg, p95 in self.get_summary(pass_name, kind)[:6]:
+                    lines.append(f"  {kind} {name}: {avg:.2f} / {p95:.2f}")
+
+        font = FONT[16]
+        surf = pygame.Surface((360, len(lines) * font.get_linesize() + 10), SRCALPHA)
+        surf.fill((0, 0, 0, 150))
+        for i, line in enumerate(lines):
+            surf.blit(font.render(line, False, (255, 255, 255)), (5, 5 + i * font.get_linesize()))
+        return surf
+
+class SpikeRecorder:
+    # Keeps the FrameStats timings of the last few frames around, and writes them to the profiles directory
+    # along with the state of the scene as soon as a frame goes over budget, so hitches can be looked at after the fact
+    def __init__(self, budget: float, window: int = 120) -> None:
+        self.enabled = False
+        self.budget = budget # Seconds of work per frame before it counts as a spike
+        self.frames = deque(maxlen=window)
+        self.cooldown = 0 # Frames left until the buffer holds a full window that wasn't part of the last capture
+
+    def record(self, frame_time: float, timings: dict[tuple[str, str, str], float], scene: Scene) -> None:
+        self.frames.append((frame_time, dict(timings)))
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        if frame_time > self.budget:
+            self.capture(scene)
+            self.cooldown = self.frames.maxlen
+
+    def capture(self, scene: Scene) -> None:
+        data = {
+            "budget_ms": self.budget * 1000,
+            "spike_ms": self.frames[-1][0] * 1000,
+            "scene": scene.get_debug_state(),
+            "frames": [{
+                "frame_ms": frame_time * 1000,
+                "timings_ms": {"/".join(key): seconds * 1000 for key, seconds in timings.items()},
+            } for frame_time, timings in self.frames],
+        }
+        # Naming the capture file in the format "spike_{hour}-{minute}-{second}-{microsecond}.json"
+        # The cooldown between captures is shorter than a second at high frame rates, so seconds alone could overwrite one
+        statfile = Path(os.path.join("profiles", str(datetime.datetime.now().strftime("spike_%H-%M-%S-%f")) + ".json"))
+        # Writing happens on another thread so that the capture doesn't cause a hitch of its own
+        Thread(target=self.write, args=(statfile, data), daemon=True).start()
+
+    def write(self, statfile: Path, data: dict) -> None:
+        statfile.parent.mkdir(exist_ok=True)
+        with open(statfile, "w") as file:
+            json.dump(data, file, indent=2)
+        print(f"Frame over budget ({data['spike_ms']:.1f} ms), capture saved to: {str(statfile)}")
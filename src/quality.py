@@ -0,0 +1,44 @@
+from collections import deque
+from enum import IntEnum
+from typing import Any
+import time
+
+from .constants import QUALITY_BUDGET, QUALITY_HEADROOM, QUALITY_WINDOW, QUALITY_HOLD
+
+class Quality(IntEnum):
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+# Watches how long frames take to make and steps the quality of the effects down when they go over budget,
+# and back up once there is plenty of headroom again. Effects ask for their setting with get(low, medium, high)
+# Started with --quality=low/medium/high the level stays fixed, the default of --quality=auto adapts
+class QualityGovernor:
+    def __init__(self, preset: str, default: str = "auto") -> None:
+        if preset != "auto" and preset.upper() not in Quality.__members__:
+            print(f"Unknown quality '{preset}', expected auto/low/medium/high, using {default}")
+            preset = default
+        self.adaptive = preset == "auto"
+        self.level = Quality.HIGH if self.adaptive else Quality[preset.upper()]
+        self.frame_times = deque(maxlen=QUALITY_WINDOW)
+        self.change_time = time.time()
+
+    def get(self, low: Any, medium: Any, high: Any) -> Any:
+        return (low, medium, high)[self.level]
+
+    def record(self, frame_time: float) -> None:
+        if not self.adaptive: return
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < QUALITY_WINDOW or time.time() - self.change_time < QUALITY_HOLD: return
+        average = sum(self.frame_times) / len(self.frame_times)
+        # The gap between the two thresholds keeps the level from flipping back and forth around the budget
+        if average > QUALITY_BUDGET and self.level > Quality.LOW:
+            self.set_level(Quality(self.level - 1))
+        elif average < QUALITY_BUDGET * QUALITY_HEADROOM and self.level < Quality.HIGH:
+            self.set_level(Quality(self.level + 1))
+
+    def set_level(self, level: Quality) -> None:
+        self.level = level
+        self.frame_times.clear()
+        self.change_time = time.time()
+        print(f"Quality set to {level.name.lower()}")
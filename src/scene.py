@@ -3,7 +3,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from manager import GameManager
 
+from .constants import FPS
 from .sprite import SpriteManager
+import pygame
 
 class Scene:
     def __init__(self, manager: GameManager, previous_scene: Scene) -> None:
@@ -11,12 +13,25 @@ class Scene:
         self.client = manager.client
         self.previous_scene = previous_scene
         self.sprite_manager = SpriteManager(self)
+        self.camera = None # Camera that sprites are drawn relative to, if the scene scrolls
         self.running = True
 
     def setup(self) -> None:
         # Only exists for a specific scene
         pass
 
+    def get_target_fps(self) -> int:
+        return FPS
+
+    def get_viewport(self) -> pygame.Rect | None:
+        # World-space area visible on the screen, None disables culling for the scene
+        return None
+
+    def get_debug_state(self) -> dict:
+        # Summary of what the scene contains, saved alongside performance captures
+        layers, classes = self.sprite_manager.get_counts()
+        return {"scene": type(self).__name__, "layers": layers, "classes": classes}
+
     def update(self) -> None:
         self.sprite_manager.update()
 
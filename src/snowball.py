@@ -7,32 +7,46 @@ if TYPE_CHECKING:
     from player import Player
 
 from random import randint, choice, uniform
-from pygame.locals import BLEND_RGB_SUB
+from pygame.locals import BLEND_RGB_SUB, RLEACCEL
 from math import atan, degrees, pi
+from itertools import count
 from uuid import uuid4
 import pygame
 import time
 
-from .constants import VEC, GRAVITY, PIXEL_SIZE
-from .sprite import VisibleSprite, Layers
+from .constants import VEC, GRAVITY, PIXEL_SIZE, SNOWBALL_ANGLES
+from .sprite import PooledSprite, Layers
 from .swirl import Swirl, VortexSwirl
-from .utils import shadow, sign
+from .utils import sign
 from .powerup import Powerup
 from .ground import Ground1
 # from .storm import Storm
 from . import assets
 
-class Snowball(VisibleSprite):
+# Snowball ids only have to be unique between clients, so a random prefix per game and a counter does the job of a uuid4
+ID_PREFIX = uuid4().hex[:12]
+ids = count()
+
+class Snowball(PooledSprite):
+    interpolated = True
+
     def __init__(self, scene: Scene, vel: tuple[float, float], sb_type: int, pos: VEC = None, follow: bool = True, stasis: bool = False) -> None:
         super().__init__(scene, Layers.SNOWBALL)
-        self.id = uuid4().hex
+        self.pos = VEC(0, 0)
+        self.vel = VEC(0, 0)
+        self.acc = VEC(0, 0)
+        self.size = VEC(0, 0)
+        self.real_rect = pygame.Rect(0, 0, 0, 0)
+        self.reset(vel, sb_type, pos, follow, stasis)
+
+    def reset(self, vel: tuple[float, float], sb_type: int, pos: VEC = None, follow: bool = True, stasis: bool = False) -> None:
+        self.id = f"{ID_PREFIX}{next(ids)}"
 
         self.player: Player = self.scene.player # Type annotation just bcs I need intellisense lol
-        self.pos = self.player.rect.topleft + self.player.SB_OFFSET if pos is None else pos
-        self.vel = VEC(vel)
-        self.acc = VEC(0, 0)
+        self.pos.update(self.player.rect.topleft + self.player.SB_OFFSET if pos is None else pos)
+        self.vel.update(vel)
+        self.acc.update(0, 0)
         self.time_mult = 1
-        self.size = VEC(0, 0)
         self.frame = 0
         self.frame_time = time.time()
         self.type = sb_type
@@ -40,9 +54,9 @@ class Snowball(VisibleSprite):
                        assets.snowball_small, assets.snowball_large, # clusters
                        assets.snowball_small, assets.snowball_large][sb_type] # strengths
         self.score = 1 if self.frames == assets.snowball_small else 4
-        self.image = self.frames[self.frame]
+        self.set_image(0)
         self.rect = self.image.get_rect(center=self.pos)
-        self.real_rect = pygame.Rect(0, 0, *(10, 10) if self.frames == assets.snowball_large else (7, 7))
+        self.real_rect.size = (10, 10) if self.frames == assets.snowball_large else (7, 7)
         self.real_rect.center = self.rect.center
         self.landed = False
         self.rotation = 0
@@ -54,12 +68,17 @@ class Snowball(VisibleSprite):
         self.really_follow = False
         self.start_time = time.time()
 
+        self.swirl = None
         if self.type == 2:
             self.swirl = Swirl(self.scene, Layers.SNOWBALL, 64)
 
+    def set_image(self, angle_step: int) -> None:
+        self.image = assets.snowball_rotations[self.frames][self.frame][angle_step]
+        self.shadow_image = assets.snowball_shadows[self.frames][self.frame][angle_step]
+
     def update(self) -> None:
         if self.frame < self.frames.length:
-            self.image = self.frames[self.frame]
+            self.set_image(0)
         self.rect = self.image.get_rect(center=self.pos)
 
         if self.landed:
@@ -76,7 +95,7 @@ class Snowball(VisibleSprite):
             return
 
         self.rotation += self.rot_speed * self.manager.dt
-        self.image = pygame.transform.rotate(self.frames[self.frame], self.rotation)
+        self.set_image(round(self.rotation * SNOWBALL_ANGLES / 360) % SNOWBALL_ANGLES)
 
         # self.acc = VEC(0, GRAVITY) * (0.4 if self.is_storm else 1)
         # self.acc += self.scene.wind_vel * (0.1 if self.is_storm else 1)
@@ -189,6 +208,12 @@ class Snowball(VisibleSprite):
         (21, 8)]
     )
 
+    @property
+    def world_rect(self) -> pygame.Rect:
+        if self.type == 5 or self.type == 6:
+            return self.rect.inflate(200, 200) # Telekinesis arrow reaches 80 pixels out from the snowball
+        return self.rect.inflate(6, 6)
+
     def draw(self) -> None:
         if self.type == 5 or self.type == 6:
             w = 21 # This is actually the extra width that the surface needs to be extended by to fit both the width of the line and the arrowhead
@@ -205,7 +230,8 @@ class Snowball(VisibleSprite):
             trans_surf.set_alpha(160)
             self.manager.screen.blit(trans_surf, topleft - (w / 2,) * 2)
 
-        self.manager.screen.blit(shadow(self.image), VEC(self.rect.topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
+        if self.manager.quality.get(False, True, True):
+            self.manager.screen.blit(self.shadow_image, VEC(self.rect.topleft) - self.scene.player.camera.offset + (3, 3), special_flags=BLEND_RGB_SUB)
         if self.scene.eliminated:
             self.image.set_alpha(80)
         self.manager.screen.blit(self.image, VEC(self.rect.topleft) - self.player.camera.offset)
@@ -233,20 +259,20 @@ class Snowball(VisibleSprite):
 
         if self.type == 3 or self.type == 4: # cluster
             for _ in range(4 if self.type == 3 else 7):
-                sb = Snowball(self.scene, self.vel + VEC(uniform(-180, 180), uniform(-180, 180)), 0, self.pos.copy())
+                sb = Snowball.spawn(self.scene, self.vel + VEC(uniform(-180, 180), uniform(-180, 180)), 0, self.pos)
                 self.scene.player.snowballs[sb.id] = sb
             for _ in range(1 if (self.type == 3) else 3):
-                sb = Snowball(self.scene, self.vel + VEC(uniform(-180, 180), uniform(-180, 180)), 1, self.pos.copy())
+                sb = Snowball.spawn(self.scene, self.vel + VEC(uniform(-180, 180), uniform(-180, 180)), 1, self.pos)
                 self.scene.player.snowballs[sb.id] = sb
 
             # funny cluster?
             if self.scene.player.funny_cluster:
                 for _ in range (30):
-                    sb = Snowball(self.scene, VEC(uniform(-1, 1), uniform(-1, 1)).normalize() * 500, self.type - 3, self.pos.copy())
+                    sb = Snowball.spawn(self.scene, VEC(uniform(-1, 1), uniform(-1, 1)).normalize() * 500, self.type - 3, self.pos)
                     self.scene.player.snowballs[sb.id] = sb
             self.kill()
 
-            Wave(self.scene, self.pos, (88, 210, 103))
+            Wave.spawn(self.scene, self.pos, (88, 210, 103))
 
         if self.type == 5 or self.type == 6: # telekinesis
             m_pos = VEC(pygame.mouse.get_pos() if not self.scene.player.aimbot else self.scene.player.bot_mpos)
@@ -259,7 +285,7 @@ class Snowball(VisibleSprite):
             if self.scene.player.funny_tele:
                 self.really_follow = True
 
-            Wave(self.scene, self.pos, (204, 102, 255))
+            Wave.spawn(self.scene, self.pos, (204, 102, 255))
 
 class SelfSnowball(Snowball):
     def collide(self) -> bool:
@@ -275,10 +301,25 @@ class SelfSnowball(Snowball):
             return True
         return False
 
-class Wave(VisibleSprite):
+class Wave(PooledSprite):
+    # Every frame of the wave in both colors it comes in, at each PIXEL_SIZE step of the radius, so drawing is a single blit
+    frames = {}
+    for color in [(88, 210, 103), (204, 102, 255)]: # Clustershot and telekinesis
+        frames[color] = []
+        for r in range(0, 131, PIXEL_SIZE):
+            surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+            pygame.draw.aacircle(surf, color + ((1 - r / 130) * 200,), (r, r), r, 3 + int((1 - r / 130) * 6))
+            surf.set_alpha(255, RLEACCEL) # Run-length encoding lets blits skip the transparent inside of the ring
+            frames[color].append(surf)
+    del color, r, surf
+
     def __init__(self, scene: Scene, pos: VEC, color: tuple[int, int, int]) -> None:
         super().__init__(scene, Layers.SNOWBALL)
-        self.pos = pos.copy()
+        self.pos = VEC(0, 0)
+        self.reset(pos, color)
+
+    def reset(self, pos: VEC, color: tuple[int, int, int]) -> None:
+        self.pos.update(pos)
         self.color = color
         self.radius = 0
 
@@ -287,8 +328,12 @@ class Wave(VisibleSprite):
         if self.radius > 130:
             super().kill()
 
-    def draw(self) -> None:
+    @property
+    def world_rect(self) -> pygame.Rect:
         r = int(self.radius)
-        trans_surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
-        pygame.draw.aacircle(trans_surf, self.color + ((1 - self.radius / 130) * 200,), (r, r), r, 3 + int((1 - self.radius / 130) * 6))
-        self.manager.screen.blit(trans_surf, self.pos - VEC(r, r) - self.scene.player.camera.offset)
+        return pygame.Rect(self.pos - VEC(r, r), (r * 2, r * 2))
+
+    def draw(self) -> None:
+        image = self.frames[self.color][int(self.radius) // PIXEL_SIZE]
+        r = image.width // 2
+        self.manager.screen.blit(image, self.pos - VEC(r, r) - self.scene.player.camera.offset)
@@ -3,67 +3,83 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from scene import Scene
 
-from random import choices, uniform, randint, choice
-import pygame
+from random import choices, choice, uniform
+import numpy as np
 
-from .constants import VEC, GRAVITY, PIXEL_SIZE, WIDTH
+from .constants import GRAVITY, PIXEL_SIZE, WIDTH, HEIGHT, TICK_RATE
 from .ground import Ground1, Ground2, Ground3
 from .sprite import VisibleSprite, Layers
 from . import assets
 
+# There are well over a thousand snowflakes at any time, so instead of being sprites of their own
+# every flake on a layer lives in a row of its renderer's arrays and is stepped all at once
+
 class SnowflakeRenderer(VisibleSprite):
     def __init__(self, scene: Scene, layer: Layers) -> None:
         super().__init__(scene, layer)
-        self.snowflakes = []
+        self.ground = {Layers.SNOWFLAKE1: Ground1, Layers.SNOWFLAKE2: Ground2, Layers.SNOWFLAKE3: Ground3}[layer]
 
-    def update(self) -> None:
-        ...
+        self.pos = np.zeros((0, 2))
+        self.vel = np.zeros((0, 2))
+        self.resistance = np.zeros(0)
+        self.half_width = np.zeros(0)
+        self.images = []
+        self.spawned = [] # (x, y, resistance, image) of flakes that join the arrays on the next update
 
-    def draw(self) -> None:
-        self.manager.screen.fblits(map(lambda s: (s.image, s.pos - s.scene.player.camera.offset), self.snowflakes))
-        self.snowflakes = []
+        # Ground height at every PIXEL_SIZE column, the ground doesn't change after the scene is set up
+        columns = sorted(self.ground.height_map)
+        self.ground_left = columns[0]
+        self.heights = np.full((columns[-1] - self.ground_left) // PIXEL_SIZE + 1, np.inf)
+        for x in columns:
+            self.heights[(x - self.ground_left) // PIXEL_SIZE] = self.ground.height_map[x]
 
-# actually not visible, but just needs to be updated
-class SnowFlake(VisibleSprite):
-    def __init__(self, scene: Scene, pos: tuple[int, int]) -> None:
-        super().__init__(scene, choice([Layers.SNOWFLAKE1, Layers.SNOWFLAKE2, Layers.SNOWFLAKE3]))
-        if self._layer == Layers.SNOWFLAKE1:
-            self.renderer = self.scene.snowflake_renderer1
-            self.ground = Ground1
-        elif self._layer == Layers.SNOWFLAKE2:
-            self.renderer = self.scene.snowflake_renderer2
-            self.ground = Ground2
-        elif self._layer == Layers.SNOWFLAKE3:
-            self.renderer = self.scene.snowflake_renderer3
-            self.ground = Ground3
+    def spawn(self, pos: tuple[int, int]) -> None:
+        image = choice(choices(assets.snowflake_atlas, assets.snowflake_weights)[0])
+        self.spawned.append((pos[0], pos[1], uniform(0.0001, 0.0012), image))
 
-        self.pos = VEC(pos)
-        self.vel = VEC(0, 0)
-        self.resistance = uniform(0.0001, 0.0012)
-
-        self.image = pygame.transform.rotate(choices(assets.snowflakes, [10, 9, 8, 7, 3, 3, 2, 2, 1, 2])[0], randint(0, 359))
-        self.size = VEC(self.image.get_size())
+    def __len__(self) -> int:
+        return len(self.images) + len(self.spawned)
 
     def update(self) -> None:
-        self.vel.y += GRAVITY * self.manager.dt
-        self.vel += self.scene.wind_vel * 5 * self.manager.dt
-        self.vel *= self.resistance ** self.manager.dt
-        self.pos += self.vel * self.manager.dt
+        if self.spawned:
+            x, y, resistance, images = zip(*self.spawned)
+            self.pos = np.concatenate((self.pos, np.column_stack((x, y))))
+            self.vel = np.concatenate((self.vel, np.zeros((len(images), 2))))
+            self.resistance = np.concatenate((self.resistance, resistance))
+            self.half_width = np.concatenate((self.half_width, [image.get_width() / 2 for image in images]))
+            self.images.extend(images)
+            self.spawned = []
+        if not self.images: return
 
-        self.renderer.snowflakes.append(self)
+        dt = self.manager.dt
+        self.vel[:, 1] += GRAVITY * dt
+        self.vel += np.multiply(self.scene.wind_vel, 5 * dt)
+        self.vel *= (self.resistance ** dt)[:, None]
+        self.pos += self.vel * dt
 
-        try:
-            if self.pos.y + self.size.x / 2 > self.ground.height_map[self.pos.x // PIXEL_SIZE * PIXEL_SIZE]:
-                self.kill()
-                return
-        except KeyError:
-            pass
-        if self.pos.y > 2000:
-            self.kill()
+        # Flakes past either end of the ground only die once they fall out of the world
+        column = (self.pos[:, 0] // PIXEL_SIZE * PIXEL_SIZE - self.ground_left) // PIXEL_SIZE
+        inside = (column >= 0) & (column < len(self.heights))
+        ground_y = np.full(len(column), np.inf)
+        ground_y[inside] = self.heights[column[inside].astype(np.intp)]
+        alive = (self.pos[:, 1] + self.half_width <= ground_y) & (self.pos[:, 1] <= 2000)
+        if not alive.all():
+            self.pos = self.pos[alive]
+            self.vel = self.vel[alive]
+            self.resistance = self.resistance[alive]
+            self.half_width = self.half_width[alive]
+            self.images = [image for image, keep in zip(self.images, alive.tolist()) if keep]
 
     def draw(self) -> None:
-        ...
-
-    def kill(self) -> None:
-        self.renderer.snowflakes.remove(self)
-        super().kill()
\ No newline at end of file
+        if not self.images: return
+        screen_pos = self.pos - self.scene.camera.offset
+        if self.manager.alpha < 1:
+            # Flakes move in straight lines within a step, so stepping back along the velocity gives the interpolated position
+            screen_pos -= self.vel * ((1 - self.manager.alpha) / TICK_RATE)
+        # Rotated flake images are at most 30 pixels wide, no need for exact sizes to tell if they're on screen
+        onscreen = (screen_pos[:, 0] > -40) & (screen_pos[:, 0] < WIDTH) & (screen_pos[:, 1] > -40) & (screen_pos[:, 1] < HEIGHT)
+        if onscreen.all():
+            self.manager.screen.fblits(zip(self.images, screen_pos.astype(np.int32).tolist()))
+        else:
+            images = [image for image, keep in zip(self.images, onscreen.tolist()) if keep]
+            self.manager.screen.fblits(zip(images, screen_pos[onscreen].astype(np.int32).tolist()))
@@ -6,6 +6,11 @@ if TYPE_CHECKING:
 from abc import ABC as AbstractClass
 from abc import abstractmethod
 from enum import Enum, auto
+from threading import Lock
+from time import perf_counter
+import pygame
+
+from .constants import VEC
 
 class Layers(Enum):
     DECOR6 = auto()
@@ -35,8 +40,14 @@ class Layers(Enum):
     GUI = auto()
 
 class Sprite(AbstractClass):
+    # Whether the sprite is drawn between its previous and current position in fixed-step mode, needs a pos attribute
+    interpolated = False
+
     def __init__(self, scene: Scene, layer: int | Layers) -> None:
         self._layer = Layers(layer)
+        self._slot = None # Index of the sprite in its layer, managed by the sprite manager
+        self._alive = False # Whether the sprite has been spawned and not killed yet, even if it is still buffered
+        self._prev_pos = None # Position before the latest simulation step, only stored for interpolated sprites
         self.scene = scene
         self.manager = scene.manager
         self.client = self.manager.client
@@ -52,6 +63,12 @@ class Sprite(AbstractClass):
     def kill(self) -> None:
         self.scene.sprite_manager.remove(self)
 
+    @property
+    def world_rect(self) -> pygame.Rect | None:
+        # World-space area covered by everything the sprite draws, used by the sprite manager for culling
+        # None means the sprite is always drawn (screen-space GUI, full screen effects, etc.)
+        return None
+
 class VisibleSprite(Sprite):
     def __init__(self, scene: Scene, layer: Layers) -> None:
         super().__init__(scene, layer)
@@ -65,24 +82,170 @@ class VisibleSprite(Sprite):
     def draw(self) -> None:
         pass
 
+# Sprites that are spawned and killed at a high rate (snowballs, hit texts, waves) are recycled instead of reconstructed
+# Once the sprite manager has applied a kill the sprite goes back to its class's pool, and spawn() hands it out again
+# through reset(), so subclasses allocate what can be reused in __init__ and set up everything else in reset()
+class PooledSprite(VisibleSprite):
+    pool_size = 256 # Most killed sprites kept around per class
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.pool = [] # Every subclass gets a pool of its own
+
+    @classmethod
+    def spawn(cls, scene: Scene, *args, **kwargs) -> PooledSprite:
+        try:
+            sprite = cls.pool.pop() # Sprites are spawned from the client thread as well
+        except IndexError:
+            return cls(scene, *args, **kwargs)
+        sprite.scene = scene
+        sprite.manager = scene.manager
+        sprite.client = sprite.manager.client
+        sprite._prev_pos = None
+        # Reset before it's added, otherwise the main thread could update and draw it with its old state in between
+        sprite.reset(*args, **kwargs)
+        scene.sprite_manager.add(sprite)
+        return sprite
+
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
+    def release(self) -> None:
+        if len(self.pool) < self.pool_size:
+            self.pool.append(self)
+
+# Sprites are stored in per-layer slot lists so that adding, removing and moving sprites are O(1)
+# Spawns and kills are never applied immediately, they are buffered as commands and applied in one batch before and
+# after each update pass and after each draw pass, so that the passes are plain iterations over lists that never change
+# Killed sprites leave a None tombstone in their slot, and the tombstones are compacted away in the same batch
+# instead of shifting the whole list on every removal, which keeps the draw order stable
 class SpriteManager:
     def __init__(self, scene: Scene) -> None:
         self.scene = scene
         self.manager = scene.manager
         self.layers: dict[Layers, list[Sprite]] = {layer: [] for layer in Layers}
+        self.commands: list[tuple[bool, Sprite, Layers]] = [] # (spawn or kill, sprite, layer)
+        # Sprites are also spawned and killed from the client thread (other players, snowballs, powerups)
+        self.lock = Lock()
 
     def update(self) -> None:
+        self.flush()
+        if self.manager.fixed_step:
+            self.store_positions()
+        stats = self.manager.frame_stats
+        if stats.enabled:
+            for layer in self.layers:
+                if not self.layers[layer]: continue
+                layer_start = perf_counter()
+                for sprite in self.layers[layer]:
+                    if not sprite._alive: continue
+                    start = perf_counter()
+                    sprite.update()
+                    stats.add("update", "class", type(sprite).__name__, perf_counter() - start)
+                stats.add("update", "layer", layer.name, perf_counter() - layer_start)
+        else:
+            for layer in self.layers:
+                for sprite in self.layers[layer]:
+                    if not sprite._alive: continue # Killed earlier in this pass
+                    sprite.update()
+        self.flush()
+
+    def store_positions(self) -> None:
+        # Taken before any sprite updates, since some sprites move others (snowballs move their swirls)
         for layer in self.layers:
             for sprite in self.layers[layer]:
-                sprite.update()
+                if not sprite.interpolated: continue
+                # Sprites spawned by the client thread might not have finished initializing
+                if (pos := getattr(sprite, "pos", None)) is not None:
+                    sprite._prev_pos = VEC(pos)
 
     def draw(self) -> None:
+        viewport = self.scene.get_viewport()
+        camera = self.scene.camera
+        alpha = self.manager.alpha
+        interpolate = camera is not None and alpha < 1
+        stats = self.manager.frame_stats
+        timed = stats.enabled
         for layer in self.layers:
+            if timed:
+                layer_start = perf_counter()
             for sprite in self.layers[layer]:
-                sprite.draw()
+                if not sprite._alive: continue
+                if viewport is not None:
+                    rect = sprite.world_rect
+                    if rect is not None and not viewport.colliderect(rect): continue
+                if timed:
+                    start = perf_counter()
+                if interpolate and sprite._prev_pos is not None:
+                    # Shifting the camera by how far the sprite is ahead of the interpolated position draws it there
+                    # without every sprite needing to know about interpolation
+                    offset = camera.offset
+                    camera.offset = offset + (sprite.pos - sprite._prev_pos) * (1 - alpha)
+                    sprite.draw()
+                    camera.offset = offset
+                else:
+                    sprite.draw()
+                if timed:
+                    stats.add("draw", "class", type(sprite).__name__, perf_counter() - start)
+            if timed and self.layers[layer]:
+                stats.add("draw", "layer", layer.name, perf_counter() - layer_start)
+        self.flush()
+
+    def get_counts(self) -> tuple[dict[str, int], dict[str, int]]:
+        # Number of live sprites per layer and per class
+        layers, classes = {}, {}
+        for layer, sprites in self.layers.items():
+            for sprite in sprites:
+                if not sprite._alive: continue
+                layers[layer.name] = layers.get(layer.name, 0) + 1
+                classes[type(sprite).__name__] = classes.get(type(sprite).__name__, 0) + 1
+        return layers, classes
 
     def add(self, sprite: Sprite) -> None:
-        self.layers[sprite._layer].append(sprite)
+        with self.lock:
+            sprite._alive = True
+            self.commands.append((True, sprite, sprite._layer))
 
     def remove(self, sprite: Sprite) -> None:
-        self.layers[sprite._layer].remove(sprite)
\ No newline at end of file
+        with self.lock:
+            if not sprite._alive:
+                raise ValueError("Sprite is not in the sprite manager")
+            sprite._alive = False
+            self.commands.append((False, sprite, sprite._layer))
+
+    def move(self, sprite: Sprite, layer: Layers) -> None:
+        self.remove(sprite)
+        sprite._layer = Layers(layer)
+        self.add(sprite)
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.commands: return
+            commands, self.commands = self.commands, []
+
+        # Commands are applied in the order they were issued, so a sprite that is spawned and killed (or moved
+        # several times) within the same frame still ends up in the right place
+        dirty = set()
+        released = set()
+        for spawn, sprite, layer in commands:
+            sprites = self.layers[layer]
+            if spawn:
+                sprite._slot = len(sprites)
+                sprites.append(sprite)
+            else:
+                sprites[sprite._slot] = None
+                sprite._slot = None
+                dirty.add(layer)
+                if isinstance(sprite, PooledSprite) and not sprite._alive:
+                    released.add(sprite)
+
+        for layer in dirty:
+            sprites = [sprite for sprite in self.layers[layer] if sprite is not None]
+            for i, sprite in enumerate(sprites):
+                sprite._slot = i
+            self.layers[layer] = sprites
+
+        # Only sprites that are out of their layer for good can be handed out again, not ones that were just moved
+        for sprite in released:
+            sprite.release()
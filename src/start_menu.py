@@ -3,9 +3,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from manager import GameManager
 
-from .constants import WIDTH, HEIGHT, FONT, TEXT_COLOR
+from .constants import WIDTH, HEIGHT, TEXT_COLOR, MENU_FPS, render_text
 from .skin_selector import SkinSelector
 from .input_box import InputBox
+from .utils import get_arg
 from .button import Button
 from .scene import Scene
 from . import assets
@@ -41,6 +42,9 @@ class StartMenu(Scene):
         self.input_box.text = text
         self.manager.new_scene("MainGame")
 
+    def get_target_fps(self) -> int:
+        return MENU_FPS
+
     def update(self) -> None:
         super().update()
 
@@ -63,6 +67,11 @@ class StartMenu(Scene):
         if K_RETURN in self.manager.key_downs:
             self.start_game()
 
+        # Nobody can type a name in headless mode, so join right away with the one given by --name=<name>
+        if self.manager.headless:
+            self.input_box.text = get_arg("--name", "headless")
+            self.start_game()
+
     def draw(self) -> None:
         self.manager.screen.blit(assets.background, (0, 0))
 
@@ -72,10 +81,10 @@ class StartMenu(Scene):
         self.manager.screen.blit(surf, (WIDTH // 2 - 374 * self.input_progress, HEIGHT // 2 - 60))
         pygame.draw.rect(self.manager.screen, (0, 0, 0), (WIDTH // 2 - 374 * self.input_progress, HEIGHT // 2 - 60, 748 * self.input_progress, 76), 3)
         if self.input_progress > 0.9:
-            text = FONT[50].render("Username:", False, TEXT_COLOR)
+            text = render_text(50, "Username:", False, TEXT_COLOR)
             self.manager.screen.blit(text, (WIDTH // 2 - 359, HEIGHT // 2 - 60))
 
-        text = FONT[24].render(self.warning, False, (255, 0, 0))
+        text = render_text(24, self.warning, False, (255, 0, 0))
         self.manager.screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - 105))
 
         super().draw()
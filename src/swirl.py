@@ -5,68 +5,177 @@ if TYPE_CHECKING:
 
 from .sprite import VisibleSprite, Layers
 # from .storm import Storm, StormAnim
-from .constants import VEC
+from .constants import VEC, SWIRL_FPS, SWIRL_LOOP
 
-import pytweening as tween
-from random import randint, uniform, choice
-from math import cos, sin, pi
+from functools import cache
+from random import uniform, choice
+from math import ceil, pi
 from pygame.locals import *
+from threading import Lock
 from uuid import uuid4
+import numpy as np
 import pygame
 import time
 
+DOT_COLOR = (140, 140, 140)
+TRAIL_FRAMES = ceil((255 - DOT_COLOR[0]) / 2) # Frames of fading for a dot's trail to be fully gone
+
+def create_dots(size: int, count: int, dot_sizes) -> dict[str, np.ndarray]:
+    # Every dot goes around its own rotated ellipse inside the swirl's square
+    half = size / 2
+    rot = np.array([uniform(0, 2 * pi) for _ in range(count)])
+    return {
+        "a": np.full(count, half - 2),
+        "b": np.array([uniform(half / 3, half * 2 / 3) for _ in range(count)]),
+        "cos_rot": np.cos(rot),
+        "sin_rot": np.sin(rot),
+        "center": np.full(count, half),
+        "phase": np.array([uniform(0, 2 * pi) for _ in range(count)]),
+        "speed": np.array([uniform(7, 12) for _ in range(count)]),
+        "radius": np.array([choice(dot_sizes) for _ in range(count)]),
+        "scale": np.zeros(count),
+        "scale_speed": np.array([uniform(0.3, 0.7) for _ in range(count)]),
+    }
+
+def get_dot_positions(dots: dict[str, np.ndarray], t: float) -> tuple[list[float], list[float]]:
+    angle = t * dots["speed"] + dots["phase"]
+    # Dots grow out from the center, easeOutExpo without a per dot function call
+    scale = np.where(dots["scale"] >= 1, 1, 1 - 2 ** (-10 * dots["scale"]))
+    u = dots["a"] * np.cos(angle) * scale
+    v = dots["b"] * np.sin(angle) * scale
+    x = dots["cos_rot"] * u - dots["sin_rot"] * v + dots["center"]
+    y = dots["sin_rot"] * u + dots["cos_rot"] * v + dots["center"]
+    return x.tolist(), y.tolist()
+
+@cache
+def get_swirl_frames(size: int, count: int, dot_sizes: tuple[int]) -> tuple[list[pygame.Surface], list[pygame.Surface]]:
+    # Plays the swirl out once at SWIRL_FPS, the intro is the dots growing in and the loop is everything after
+    dots = create_dots(size, count, dot_sizes)
+    # Every dot goes around a whole number of times per loop so that the animation repeats exactly
+    dots["speed"] = np.maximum(np.round(dots["speed"] * SWIRL_LOOP / (2 * pi)), 1) * 2 * pi / SWIRL_LOOP
+    # Once every dot is fully grown and the trails from growing have faded, every frame repeats SWIRL_LOOP seconds later
+    intro_length = ceil(SWIRL_FPS / dots["scale_speed"].min()) + 1 + TRAIL_FRAMES
+
+    image = pygame.Surface((size, size))
+    image.fill((255, 255, 255))
+    frames = []
+    for frame in range(intro_length + SWIRL_LOOP * SWIRL_FPS):
+        for x, y, radius in zip(*get_dot_positions(dots, frame / SWIRL_FPS), dots["radius"].tolist()):
+            pygame.draw.aacircle(image, DOT_COLOR, (x, y), radius)
+        dots["scale"] = np.minimum(dots["scale"] + dots["scale_speed"] / SWIRL_FPS, 1)
+        image.fill((2, 2, 2), special_flags=BLEND_ADD)
+        frames.append(image.copy())
+    return frames[:intro_length], frames[intro_length:]
+
 class Swirl(VisibleSprite):
-    def __init__(self, scene: Scene, layer: Layers, size: int, density: int = 6, dot_sizes=[1, 2, 2]) -> None:
+    # Vortex snowballs and the big snowballs in the dig progress bar never change shape,
+    # so every swirl of a size shares one pre-rendered animation and only keeps track of its own time
+    interpolated = True
+
+    def __init__(self, scene: Scene, layer: Layers, size: int, density: int = 6, dot_sizes=(1, 2, 2)) -> None:
         super().__init__(scene, layer)
         self.size = size
         self.pos = VEC(0, 0)
 
-        self.image = pygame.Surface((self.size, self.size))
-        self.image.fill((255, 255, 255))
-        self.dots = []
-        for _ in range(density):
-            size = self.size / 2
-            b = uniform(size / 3, size * 2 / 3)
-            rot = uniform(0, 2 * pi)
-            self.dots.append([
-                # late binding GAHHHHHH
-                lambda t, sc, b=b, rot=rot: cos(rot) * ((size - 2) * cos(t)) * sc - sin(rot) * (b * sin(t)) * sc + size,
-                lambda t, sc, b=b, rot=rot: sin(rot) * ((size - 2) * cos(t)) * sc + cos(rot) * (b * sin(t)) * sc + size,
-                (randint(90, 160),) * 3, # color
-                uniform(0, 2 * pi), # phase
-                uniform(7, 12), # speed
-                choice(dot_sizes), # radius
-                0, # scale
-                uniform(0.3, 0.7) # scale speed
-            ])
+        self.intro, self.loop = self.get_frames(size, density, dot_sizes)
+        self.start_time = time.time()
+        self.image = self.intro[0]
         self.visible = True
-        self.alpha = 255
+
+    @staticmethod
+    def get_frames(size: int, density: int = 6, dot_sizes=(1, 2, 2)) -> tuple[list[pygame.Surface], list[pygame.Surface]]:
+        # A baked frame costs one blit however many dots are in it, so the animation doesn't thin out with the quality level
+        # and one render per size serves every level, a level change never has to render a new one mid match
+        return get_swirl_frames(size, density, tuple(dot_sizes))
 
     def update(self) -> None:
-        for dot in self.dots:
-            real_scale = tween.easeOutExpo(dot[6])
-            pos = VEC(dot[0](time.time() * dot[4] + dot[3], real_scale), dot[1](time.time() * dot[4] + dot[3], real_scale))
-            pygame.draw.aacircle(self.image, (140, 140, 140), pos, dot[5])
-            dot[6] += dot[7] * self.manager.dt
-            if dot[6] > 1:
-                dot[6] = 1
+        frame = int((time.time() - self.start_time) * SWIRL_FPS)
+        if frame < len(self.intro):
+            self.image = self.intro[frame]
+        else:
+            self.image = self.loop[(frame - len(self.intro)) % len(self.loop)]
+
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos, (self.size, self.size))
 
     def draw(self) -> None:
         if not self.visible: return
-        self.image.fill((2, 2, 2), special_flags=BLEND_ADD)
         self.scene.manager.screen.blit(self.image, self.pos - self.scene.player.camera.offset, special_flags=BLEND_MULT)
 
-class VortexSwirl(Swirl):
+class SwirlDots(VisibleSprite):
+    # Vortices shrink away at the end so they can't be pre-rendered, instead the dots of every vortex
+    # live in one set of arrays and are all moved in one step a frame
+    def __init__(self, scene: Scene) -> None:
+        # First layer, so the dots are drawn before the vortices fade their trails like they used to
+        super().__init__(scene, Layers.DECOR6)
+        self.dots = create_dots(0, 0, [0])
+        self.swirls = [] # The vortex every dot is drawn on
+        # Vortices are added and removed from the client thread as well (landed and start messages),
+        # so the changes are queued and only applied to the arrays at the start of update on the main thread
+        self.commands: list[tuple[bool, VortexSwirl, dict[str, np.ndarray] | None]] = [] # (add or remove, swirl, dots)
+        self.lock = Lock()
+
+    def add(self, swirl: VortexSwirl, count: int, dot_sizes) -> None:
+        dots = create_dots(swirl.size, count, dot_sizes)
+        with self.lock:
+            self.commands.append((True, swirl, dots))
+
+    def shrink(self, swirl: VortexSwirl) -> None:
+        # Scales down 3.5 times faster than it grew in
+        rows = np.fromiter((owner is swirl for owner in self.swirls), bool, len(self.swirls))
+        self.dots["scale_speed"][rows] *= -3.5
+
+    def remove(self, swirl: VortexSwirl) -> None:
+        with self.lock:
+            self.commands.append((False, swirl, None))
+
+    def flush(self) -> None:
+        with self.lock:
+            if not self.commands: return
+            commands, self.commands = self.commands, []
+
+        added = [(swirl, dots) for add, swirl, dots in commands if add]
+        removed = {swirl for add, swirl, _ in commands if not add}
+        if added:
+            for key in self.dots:
+                self.dots[key] = np.concatenate((self.dots[key], *(dots[key] for _, dots in added)))
+            for swirl, dots in added:
+                self.swirls.extend([swirl] * len(dots["radius"]))
+        # Removals go after the adds, a vortex added and removed within the same frame is added and then dropped again
+        if removed:
+            keep = np.fromiter((owner not in removed for owner in self.swirls), bool, len(self.swirls))
+            for key in self.dots:
+                self.dots[key] = self.dots[key][keep]
+            self.swirls = [owner for owner in self.swirls if owner not in removed]
+
+    def update(self) -> None:
+        self.flush()
+        if not self.swirls: return
+
+        for swirl, x, y, radius in zip(self.swirls, *get_dot_positions(self.dots, time.time()), self.dots["radius"].tolist()):
+            pygame.draw.aacircle(swirl.image, DOT_COLOR, (x, y), radius)
+        self.dots["scale"] = np.clip(self.dots["scale"] + self.dots["scale_speed"] * self.manager.dt, 0, 1)
+
+    def draw(self) -> None:
+        pass
+
+class VortexSwirl(VisibleSprite):
+    interpolated = True
     instances = {}
 
     def __init__(self, scene: Scene, layer: Layers, pos: VEC, size: int, density: int = 6, suck: bool = False) -> None:
-        super().__init__(scene, layer, size, density, range(2, 4))
+        super().__init__(scene, layer)
         # self.storm = storm
+        self.size = size
         self.pos = pos
+        self.image = pygame.Surface((self.size, self.size))
+        self.image.fill((255, 255, 255))
+        self.scene.swirl_dots.add(self, max(1, round(density * self.manager.quality.get(0.4, 0.7, 1))), range(2, 4))
+        self.shrinking = False
         self.timer = time.time()
         self.startTime = time.time()
         self.maxTime = 12
-        self.orig_img = self.image.copy()
         self.suck = suck
 
         self.id = uuid4().hex
@@ -74,7 +183,6 @@ class VortexSwirl(Swirl):
 
     def update(self) -> None:
         # if getattr(self, "storm", None) is None: return
-        super().update()
 
         # sucking is on the thrower's side?????
         if self.suck and not self.scene.eliminated:
@@ -82,29 +190,28 @@ class VortexSwirl(Swirl):
                 vel = (1 - dist / 250) * (self.pos + (self.size / 2,) * 2 - self.scene.player.pos).normalize() * 20
                 vel.y *= 0.5
                 self.scene.player.vel += vel
-        for snowball in self.scene.player.snowballs.values():
-            if (dist := snowball.pos.distance_to(self.pos + (self.size / 2,) * 2)) < 250 and dist > 0:
-                snowball.vel *= ((dist + 10) / 260) ** self.manager.dt # more friction the closer to center the snowball gets
-                snowball.vel += (1 - dist / 250) * (self.pos + (self.size / 2, self.size / 2) - snowball.pos).normalize() * 150 # normal accel (toward center)
-                snowball.vel += (1.1 - dist / 250) * (self.pos + (self.size / 2, self.size / 2) - snowball.pos).normalize().rotate(-90) * 10 # tangent accel (perp. to normal)
-                snowball.follow = False # don't mess with people's camera if snowball gets stuck
+        # Snowballs are pulled by all vortices at once in the scene's VortexField
 
-        self.image.fill((0, 0, 0), special_flags=BLEND_ADD)
+        # The dots were already drawn in by the scene's SwirlDots
+        self.image.fill((2, 2, 2), special_flags=BLEND_ADD)
 
         if time.time() - self.startTime > self.maxTime:
             self.kill()
-        if time.time() - self.startTime > self.maxTime - 1:
-            for dot in self.dots:
-                dot[6] -= 4.5 * dot[7] * self.manager.dt
-                if dot[6] < 0:
-                    dot[6] = 0
+        if time.time() - self.startTime > self.maxTime - 1 and not self.shrinking:
+            self.shrinking = True
+            self.scene.swirl_dots.shrink(self)
+
+    @property
+    def world_rect(self) -> pygame.Rect:
+        return pygame.Rect(self.pos, (self.size, self.size))
 
     def draw(self) -> None:
-        super().draw()
+        self.scene.manager.screen.blit(self.image, self.pos - self.scene.player.camera.offset, special_flags=BLEND_MULT)
 
     def kill(self) -> None:
         try:
             __class__.instances.pop(self.id)
         except KeyError:
             pass
+        self.scene.swirl_dots.remove(self)
         super().kill()
@@ -0,0 +1,86 @@
+from math import sqrt
+
+from .constants import VEC, GRAVITY, PIXEL_SIZE, FPS
+
+# Closed form snowball paths for when no vortex is pulling on them, the only acceleration is gravity plus the wind
+# Snowballs are stepped by adding the acceleration to the velocity before moving, so with a step size the
+# positions match a stepped path exactly rather than the ideal parabola (the difference is half a step of acceleration)
+
+def get_acceleration(wind_vel: VEC) -> VEC:
+    """Returns the acceleration of a snowball in the given wind, the same as Snowball.update uses"""
+    return VEC(0, GRAVITY) + wind_vel
+
+def get_position(pos: VEC, vel: VEC, acc: VEC, t: float, step: float = 0) -> VEC:
+    """Returns where a snowball thrown from pos at vel is after t seconds, stepped every step seconds (0 for the ideal path)"""
+    return pos + vel * t + acc * (t * (t + step) / 2)
+
+def get_velocity(vel: VEC, acc: VEC, t: float) -> VEC:
+    """Returns the velocity of a snowball thrown at vel after t seconds"""
+    return vel + acc * t
+
+def time_to_height(y: float, vel_y: float, acc_y: float, height: float) -> float | None:
+    """Returns the first time a snowball at y falls past height, or None if it never does"""
+    if y >= height:
+        return 0
+    if acc_y == 0:
+        return (height - y) / vel_y if vel_y > 0 else None
+    # Solving y + vel_y * t + acc_y * t^2 / 2 = height, the later root is the one on the way down
+    disc = vel_y ** 2 + 2 * acc_y * (height - y)
+    if disc < 0:
+        return None
+    root = sqrt(disc)
+    times = [t for t in ((-vel_y - root) / acc_y, (-vel_y + root) / acc_y) if t >= 0]
+    return min(times) if times else None
+
+def time_to_ground(pos: VEC, vel: VEC, acc: VEC, height_map: dict[int, float]) -> float | None:
+    """Returns when a snowball hits the ground in height_map or leaves its ends, or None if it never comes down"""
+    heights = height_map.values()
+    # The snowball can't touch the ground before it's as low as the highest point or after it's past the lowest
+    start = time_to_height(pos.y, vel.y, acc.y, min(heights))
+    end = time_to_height(pos.y, vel.y, acc.y, max(heights))
+    if start is None:
+        return None
+    # Only that stretch is checked against the ground, once a frame like Snowball.update does
+    below = lambda t: (ground_y := height_map.get(int(get_position(pos, vel, acc, t).x // PIXEL_SIZE * PIXEL_SIZE))) is None \
+                      or get_position(pos, vel, acc, t).y > ground_y
+    t = start
+    while not below(t):
+        if end is not None and t > end:
+            return end
+        t += 1 / FPS
+    # Narrowing down when within the last frame it went in
+    low, high = max(start, t - 1 / FPS), t
+    for _ in range(8):
+        if below((low + high) / 2):
+            high = (low + high) / 2
+        else:
+            low = (low + high) / 2
+    return high
+
+def get_landing(pos: VEC, vel: VEC, acc: VEC, height_map: dict[int, float]) -> VEC | None:
+    """Returns where a snowball hits the ground in height_map, or None if it never comes down"""
+    if (t := time_to_ground(pos, vel, acc, height_map)) is None:
+        return None
+    return get_position(pos, vel, acc, t)
+
+def velocity_to_hit(pos: VEC, target: VEC, acc: VEC, speed: float, lob: bool = False) -> VEC | None:
+    """Returns the velocity of the given speed that takes a snowball from pos through target, or None if it can't reach
+    The flatter of the two paths is returned unless lob is set"""
+    offset = target - pos
+    # With t^2 as q, |offset - acc * t^2 / 2| = speed * t is a quadratic in q
+    a = acc.length_squared() / 4
+    b = offset.dot(acc) + speed ** 2
+    c = offset.length_squared()
+    if c == 0:
+        return None
+    if a == 0:
+        q = c / b
+    else:
+        disc = b ** 2 - 4 * a * c
+        if disc < 0:
+            return None
+        q = (b + sqrt(disc) if lob else b - sqrt(disc)) / (2 * a)
+    if q <= 0:
+        return None
+    t = sqrt(q)
+    return offset / t - acc * (t / 2)
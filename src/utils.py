@@ -1,11 +1,20 @@
 from multipledispatch import dispatch
+from collections import OrderedDict
 import pygame
+import sys
 
-from .constants import VEC
+from .constants import VEC, SHADOW_CACHE_SIZE, SHADOW_ANGLE
 
 inttup = lambda tup: tuple((int(tup[0]), int(tup[1])))
 intvec = lambda vec: VEC((int(vec[0]), int(vec[1])))
 
+def get_arg(name: str, default: str) -> str:
+    """Returns the value of a "--name=value" command line argument, or the default if it wasn't given"""
+    for arg in sys.argv:
+        if arg.startswith(name + "="):
+            return arg[len(name) + 1:]
+    return default
+
 def sign(num: int | float) -> int:
     """Returns the sign of the num (+/-) as -1, 0, or 1"""
     return (num > 0) - (num < 0)
@@ -13,6 +22,38 @@ def sign(num: int | float) -> int:
 def shadow(surf: pygame.Surface) -> pygame.Surface:
     return pygame.mask.from_surface(surf).to_surface(setcolor=(50, 50, 50))
 
+class LRUCache(OrderedDict):
+    """OrderedDict that drops the least recently used items once it holds more than max_size"""
+    def __init__(self, max_size: int) -> None:
+        super().__init__()
+        self.max_size = max_size
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+shadow_cache = LRUCache(SHADOW_CACHE_SIZE)
+
+def get_shadow(image: pygame.Surface, flip: bool = False, rotation: float = 0) -> pygame.Surface:
+    """Returns the shadow of image flipped then rotated, cached by the image and the transform with the rotation
+    snapped to SHADOW_ANGLE degrees, the shadow is the same size as the transformed image give or take a pixel"""
+    angle = round(rotation / SHADOW_ANGLE) * SHADOW_ANGLE % 360
+    key = (image, flip, angle)
+    if (cached := shadow_cache.get(key)) is not None:
+        return cached
+    surf = pygame.transform.flip(image, True, False) if flip else image
+    if angle:
+        surf = pygame.transform.rotate(surf, angle)
+    shadow_cache[key] = shadow(surf)
+    return shadow_cache[key]
+
 # The clamp functions clamps a value to the max or min if it exceeds them
 
 @dispatch((int, float), (int, float), (int, float))
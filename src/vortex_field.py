@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from scene import Scene
+
+from math import hypot
+import numpy as np
+
+from .sprite import VisibleSprite, Layers
+from .swirl import VortexSwirl
+from .constants import VEC
+
+RADIUS = 250 # Distance from the center that vortices reach
+PULL = 150 # Acceleration toward the center, scaled down the further out
+SPIN = 10 # Acceleration perpendicular to the pull, makes snowballs orbit instead of falling straight in
+
+# The combined pull of every vortex on the scene, kept as arrays so that all of the player's snowballs are pulled in one step
+# The pull of each vortex in range is worked out from the same starting velocity and added up, rather than applied one vortex after another
+
+class VortexField(VisibleSprite):
+    def __init__(self, scene: Scene) -> None:
+        # First layer, so snowballs are pulled before they move like they were when every vortex pulled on them itself
+        super().__init__(scene, Layers.DECOR6)
+        self.ids = ()
+        self.centers = np.zeros((0, 2))
+        self.center_list = []
+
+    def sync(self) -> None:
+        # Vortices never move, so the arrays only change when one appears or goes away
+        if (ids := tuple(VortexSwirl.instances)) == self.ids: return
+        self.ids = ids
+        self.center_list = [tuple(v.pos + (v.size / 2, v.size / 2)) for v in VortexSwirl.instances.values()]
+        self.centers = np.array(self.center_list).reshape(-1, 2)
+
+    def apply(self, pos: np.ndarray, vel: np.ndarray, dt: float) -> np.ndarray:
+        # pos and vel are (n, 2) arrays, vel is changed in place, returns which positions are in reach of any vortex
+        offset = self.centers[None, :, :] - pos[:, None, :]
+        dist = np.hypot(offset[..., 0], offset[..., 1])
+        near = (dist < RADIUS) & (dist > 0)
+        if not near.any():
+            return near.any(axis=1)
+        dist = np.where(near, dist, 1)
+        normal = offset / dist[..., None]
+        tangent = np.stack((normal[..., 1], -normal[..., 0]), axis=-1)
+        pull = np.where(near, 1 - dist / RADIUS, 0)[..., None] * normal * PULL
+        spin = np.where(near, 1.1 - dist / RADIUS, 0)[..., None] * tangent * SPIN
+        # More friction the closer to center
+        vel *= np.prod(np.where(near, ((dist + 10) / (RADIUS + 10)) ** dt, 1), axis=1)[:, None]
+        vel += (pull + spin).sum(axis=1)
+        return near.any(axis=1)
+
+    def pull(self, pos: VEC, vel: VEC, dt: float) -> None:
+        # Same as apply for a single position, for stepping one trajectory where numpy's overhead per call would outweigh the work
+        if not self.center_list: return
+        friction = 1
+        ax = ay = 0
+        for cx, cy in self.center_list:
+            dx, dy = cx - pos.x, cy - pos.y
+            dist = hypot(dx, dy)
+            if not 0 < dist < RADIUS: continue
+            friction *= ((dist + 10) / (RADIUS + 10)) ** dt
+            pull = (1 - dist / RADIUS) * PULL / dist
+            spin = (1.1 - dist / RADIUS) * SPIN / dist
+            ax += pull * dx + spin * dy
+            ay += pull * dy - spin * dx
+        vel *= friction
+        vel += (ax, ay)
+
+    def update(self) -> None:
+        self.sync()
+        if not self.center_list: return
+        snowballs = list(self.scene.player.snowballs.values())
+        if not snowballs: return
+        pos = np.array([tuple(snowball.pos) for snowball in snowballs])
+        vel = np.array([tuple(snowball.vel) for snowball in snowballs])
+        pulled = self.apply(pos, vel, self.manager.dt)
+        for snowball, new_vel, is_pulled in zip(snowballs, vel.tolist(), pulled.tolist()):
+            if not is_pulled: continue
+            snowball.vel.update(new_vel)
+            snowball.follow = False # don't mess with people's camera if snowball gets stuck
+
+    def draw(self) -> None:
+        pass